@@ -15,26 +15,38 @@ Features:
 - Redis-based session management
 
 Usage:
-    python main.py --port 8000 --redis-url redis://localhost:6379
+    python main.py --port 8000 --redis-url redis://localhost:6379 --workers 4
 """
 
 import sys
 import os
+import re
+import time
 import asyncio
-import json
 import logging
-from typing import Dict, Optional, List
+import operator
+from functools import cached_property, lru_cache, reduce
+from typing import Callable, Dict, NamedTuple, Optional, List, Tuple
 from dataclasses import dataclass
 
 # Add parent package to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../python/src"))
 
 from fastapi import FastAPI, Request, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
+import orjson
 import uvicorn
-import redis
+import redis.asyncio as aioredis
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    generate_latest,
+    multiprocess,
+)
 
 from prompt_guard import PromptGuard, configure_logging, get_logger
 from prompt_guard.storage.redis_storage import RedisMappingStorage
@@ -49,6 +61,92 @@ from rate_limiter import (
 configure_logging(level="INFO", json_format=True)
 logger = get_logger("proxy")
 
+# Default upper bound on request body size (1 MiB)
+MAX_BODY_SIZE = 1024 * 1024
+
+# Seconds a storage health check result is reused by the metrics endpoint
+STORAGE_HEALTH_TTL = 5.0
+
+# Seconds a rate-limit check waits for a free Redis connection
+REDIS_POOL_TIMEOUT = 5.0
+
+class ProxyMetrics(NamedTuple):
+    """Prometheus counters of the proxy."""
+    requests_total: Counter
+    requests_anonymized: Counter
+    pii_detected: Counter
+    errors: Counter
+    rate_limit_exceeded: Counter
+
+
+@lru_cache(maxsize=None)
+def _metrics() -> ProxyMetrics:
+    """
+    Create the Prometheus counters on first use.
+
+    Running this file as a script loads it twice (as __main__, then as
+    "main" when uvicorn imports the app), so registering the counters at
+    import time would fail with a duplicated timeseries. With several
+    workers, PROMETHEUS_MULTIPROC_DIR makes each process write its own
+    files, which are aggregated on scrape.
+
+    Returns:
+        The proxy counters
+    """
+    return ProxyMetrics(
+        requests_total=Counter(
+            "proxy_requests", "Total proxied requests", ["provider"]
+        ),
+        requests_anonymized=Counter(
+            "proxy_requests_anonymized",
+            "Requests in which PII was anonymized",
+            ["provider"],
+        ),
+        pii_detected=Counter(
+            "proxy_pii_detected", "PII entities detected in requests", ["provider"]
+        ),
+        errors=Counter(
+            "proxy_errors", "Failed proxy requests", ["provider"]
+        ),
+        rate_limit_exceeded=Counter(
+            "proxy_rate_limit_exceeded",
+            "Requests rejected by rate limiting",
+            ["limit_type"],
+        ),
+    )
+
+
+# Client request headers not forwarded upstream (Starlette lower-cases names)
+_UNFORWARDED_REQUEST_HEADERS = frozenset({"host", "content-length", "content-type"})
+
+# Upstream response headers invalidated by decoding/rewriting the body
+_UNFORWARDED_RESPONSE_HEADERS = frozenset(
+    {"content-length", "content-encoding", "transfer-encoding", "connection"}
+)
+
+# JSON metric name -> Prometheus counter name
+_METRIC_NAMES = {
+    "requests_total": "proxy_requests",
+    "requests_anonymized": "proxy_requests_anonymized",
+    "pii_detected": "proxy_pii_detected",
+    "errors": "proxy_errors",
+    "rate_limit_exceeded": "proxy_rate_limit_exceeded",
+}
+
+
+def get_metrics_registry() -> CollectorRegistry:
+    """
+    Get the registry to expose, aggregating across workers when needed.
+
+    Returns:
+        Registry holding the proxy counters
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
 
 @dataclass
 class ProxyConfig:
@@ -67,6 +165,45 @@ class ProxyConfig:
     global_requests_per_second: int = 100
     burst_size: int = 10
     trusted_ips: List[str] = None
+    redis_max_connections: int = 256
+    rate_limit_shards: int = 1
+    global_limit_batch_size: int = 1
+    # Request size limiting
+    max_body_size: int = MAX_BODY_SIZE
+    # Number of uvicorn worker processes
+    workers: int = 1
+
+    @classmethod
+    def from_env(cls) -> "ProxyConfig":
+        """
+        Build configuration from environment variables.
+
+        Every uvicorn worker imports the app independently, so the
+        environment is the one source of configuration they all share.
+
+        Returns:
+            ProxyConfig populated from PORT, HOST, REDIS_URL, POLICY,
+            DETECTORS, MAX_BODY_SIZE, WORKERS, REDIS_MAX_CONNECTIONS,
+            RATE_LIMIT_SHARDS and GLOBAL_LIMIT_BATCH_SIZE (defaults
+            otherwise)
+        """
+        detectors = os.environ.get("DETECTORS")
+        return cls(
+            port=int(os.environ.get("PORT", cls.port)),
+            host=os.environ.get("HOST", cls.host),
+            redis_url=os.environ.get("REDIS_URL", cls.redis_url),
+            policy=os.environ.get("POLICY", cls.policy),
+            detectors=detectors.split(",") if detectors else None,
+            max_body_size=int(os.environ.get("MAX_BODY_SIZE", cls.max_body_size)),
+            workers=int(os.environ.get("WORKERS", cls.workers)),
+            redis_max_connections=int(
+                os.environ.get("REDIS_MAX_CONNECTIONS", cls.redis_max_connections)
+            ),
+            rate_limit_shards=int(os.environ.get("RATE_LIMIT_SHARDS", cls.rate_limit_shards)),
+            global_limit_batch_size=int(
+                os.environ.get("GLOBAL_LIMIT_BATCH_SIZE", cls.global_limit_batch_size)
+            ),
+        )
 
 
 class LLMProxy:
@@ -85,14 +222,33 @@ class LLMProxy:
             "base_url": "https://api.openai.com",
             "auth_header": "Authorization",
             "message_paths": ["messages", "prompt"],
+            # Chat completions, then legacy completions
+            "response_content_paths": (
+                ("choices", 0, "message", "content"),
+                ("choices", 0, "text"),
+            ),
         },
         "anthropic": {
             "base_url": "https://api.anthropic.com",
             "auth_header": "x-api-key",
             "message_paths": ["messages", "prompt"],
+            # Messages API, then legacy text completions
+            "response_content_paths": (
+                ("content", 0, "text"),
+                ("completion",),
+            ),
         },
     }
 
+    # Cheap screen for the regex detector: every pattern it can match needs a
+    # digit, an "@", or two adjacent capitalised words. Text without any of
+    # these cannot produce a detection, so the full scan is skipped.
+    _HAS_PII_HINT = re.compile(r"\d|@|[A-Z][a-z]+\s+[A-Z][a-z]")
+
+    # Joins messages for a single anonymize call. NUL never appears in PII
+    # patterns, so no detection can span two messages.
+    _MESSAGE_SEPARATOR = "\n\x00\n"
+
     def __init__(self, config: ProxyConfig):
         """
         Initialize the LLM proxy.
@@ -101,9 +257,10 @@ class LLMProxy:
             config: Proxy configuration
         """
         self.config = config
-        self.guard = PromptGuard(
-            detectors=config.detectors or ["regex"],
-            policy=config.policy,
+        self._detectors = config.detectors or ["regex"]
+        # The hint screen only covers the regex detector's patterns
+        self._pii_hint = (
+            self._HAS_PII_HINT if self._detectors == ["regex"] else None
         )
         self.storage = RedisMappingStorage(
             redis_url=config.redis_url,
@@ -113,33 +270,56 @@ class LLMProxy:
         # Initialize rate limiters
         self.rate_limiter = None
         self.global_limiter = None
+        self._redis = None
         if config.enable_rate_limiting:
-            redis_client = redis.from_url(config.redis_url, decode_responses=True)
+            # Async client so rate-limit checks never block the event loop,
+            # with a pool sized for concurrent requests. Once every
+            # connection is in use, checks wait for one instead of failing.
+            pool = aioredis.BlockingConnectionPool.from_url(
+                config.redis_url,
+                max_connections=config.redis_max_connections,
+                timeout=REDIS_POOL_TIMEOUT,
+                decode_responses=True,
+            )
+            redis_client = aioredis.Redis(connection_pool=pool)
+            self._redis = redis_client
             rate_limit_config = RateLimitConfig(
                 requests_per_minute=config.requests_per_minute,
                 requests_per_hour=config.requests_per_hour,
                 burst_size=config.burst_size,
                 trusted_ips=set(config.trusted_ips or []),
+                shards=config.rate_limit_shards,
             )
             self.rate_limiter = TokenBucketRateLimiter(redis_client, rate_limit_config)
             self.global_limiter = GlobalRateLimiter(
-                redis_client, config.global_requests_per_second
+                redis_client,
+                config.global_requests_per_second,
+                batch_size=config.global_limit_batch_size,
             )
-        
-        self.metrics = {
-            "requests_total": 0,
-            "requests_anonymized": 0,
-            "pii_detected": 0,
-            "errors": 0,
-            "rate_limit_exceeded": 0,
+
+        # (monotonic time, result) of the last storage health check
+        self._storage_health_cache = (0.0, None)
+
+        # Per-provider message locators
+        self._slot_collectors = {
+            name: self._build_slot_collector(provider_config["message_paths"])
+            for name, provider_config in self.PROVIDERS.items()
         }
 
+        # Shared upstream client so connections (and TLS sessions) are reused
+        self.http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=500),
+            timeout=60.0,
+        )
+
+
     async def proxy_request(
         self,
         provider: str,
         endpoint: str,
         request: Request,
-    ) -> JSONResponse | StreamingResponse:
+    ) -> Response | StreamingResponse:
         """
         Proxy an LLM API request with PII protection.
 
@@ -151,7 +331,9 @@ class LLMProxy:
         Returns:
             Proxied response (with de-anonymized content)
         """
-        self.metrics["requests_total"] += 1
+        metrics = _metrics()
+        provider_label = provider if provider in self.PROVIDERS else "unknown"
+        metrics.requests_total.labels(provider_label).inc()
 
         # Get client context
         client_ip = request.client.host if request.client else "unknown"
@@ -165,15 +347,13 @@ class LLMProxy:
         # Check rate limits
         if self.rate_limiter:
             try:
-                # Check global rate limit first
-                if self.global_limiter:
-                    self.global_limiter.check_global_limit()
-                
-                # Check per-user/IP rate limit
-                self.rate_limiter.check_rate_limit(client_ip, user_id)
+                # Check global and per-user/IP limits in one round trip
+                await self.rate_limiter.check_rate_limit(
+                    client_ip, user_id, global_limiter=self.global_limiter
+                )
                 
             except RateLimitExceeded as e:
-                self.metrics["rate_limit_exceeded"] += 1
+                metrics.rate_limit_exceeded.labels(e.limit_type).inc()
                 logger.warning(
                     "Rate limit exceeded",
                     client_ip=client_ip,
@@ -191,25 +371,28 @@ class LLMProxy:
         if not provider_config:
             raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
 
+        # Read the body before any processing so oversized payloads are
+        # rejected without being buffered in full
+        raw_body = await self._read_body(request)
+
         try:
             # Get request body
-            body = await request.json()
-
-            # Create session
-            session_id = self.storage.create_session(
-                user_id=user_id,
-                metadata={"provider": provider, "endpoint": endpoint},
-            )
-            logger.set_session_id(session_id)
+            body = orjson.loads(raw_body)
 
             # Anonymize messages in the request
-            anonymized_body, mapping = self._anonymize_request_body(body, provider_config)
+            anonymized_body, mapping = self._anonymize_request_body(body, provider)
 
-            # Store mapping for this session
+            # Only requests with PII need a session to hold their mapping
+            session_id = None
             if mapping:
+                session_id = self.storage.create_session(
+                    user_id=user_id,
+                    metadata={"provider": provider, "endpoint": endpoint},
+                )
+                logger.set_session_id(session_id)
                 self.storage.store_mapping(session_id, mapping)
-                self.metrics["requests_anonymized"] += 1
-                self.metrics["pii_detected"] += len(mapping)
+                metrics.requests_anonymized.labels(provider_label).inc()
+                metrics.pii_detected.labels(provider_label).inc(len(mapping))
                 
                 # Log PII detection (without values)
                 entity_types = list(set([k.split('_')[0].strip('[]') for k in mapping.keys()]))
@@ -223,20 +406,24 @@ class LLMProxy:
             # Build target URL
             target_url = f"{provider_config['base_url']}{endpoint}"
 
-            # Forward headers (excluding host)
-            headers = dict(request.headers)
-            headers.pop("host", None)
-            headers["X-Session-ID"] = session_id  # Add session ID for tracking
-
-            # Make the proxied request
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method=request.method,
-                    url=target_url,
-                    json=anonymized_body,
-                    headers=headers,
-                    timeout=60.0,
-                )
+            # Forward headers (excluding host and the original body length)
+            headers = {
+                key: value
+                for key, value in request.headers.items()
+                if key not in _UNFORWARDED_REQUEST_HEADERS
+            }
+            headers["content-type"] = "application/json"
+            if session_id:
+                headers["X-Session-ID"] = session_id  # Add session ID for tracking
+
+            # Make the proxied request without buffering the response body
+            upstream_request = self.http.build_request(
+                method=request.method,
+                url=target_url,
+                content=orjson.dumps(anonymized_body),
+                headers=headers,
+            )
+            response = await self.http.send(upstream_request, stream=True)
 
             # Handle streaming responses
             if "stream" in body and body.get("stream"):
@@ -245,7 +432,10 @@ class LLMProxy:
                 )
 
             # Handle regular responses
-            response_data = response.json()
+            try:
+                response_data = orjson.loads(await response.aread())
+            finally:
+                await response.aclose()
 
             # De-anonymize response
             if mapping:
@@ -253,14 +443,15 @@ class LLMProxy:
                     response_data, mapping, provider_config
                 )
 
-            return JSONResponse(
-                content=response_data,
+            return Response(
+                content=orjson.dumps(response_data),
                 status_code=response.status_code,
-                headers=dict(response.headers),
+                headers=self._response_headers(response),
+                media_type="application/json",
             )
 
         except Exception as e:
-            self.metrics["errors"] += 1
+            metrics.errors.labels(provider_label).inc()
             logger.error(
                 "Proxy request failed",
                 exc_info=True,
@@ -273,48 +464,141 @@ class LLMProxy:
             # Clear logging context
             logger.clear_context()
 
+    async def _read_body(self, request: Request) -> bytes:
+        """
+        Read the request body, enforcing the configured size limit.
+
+        Clients may omit Content-Length (chunked transfer), so the limit is
+        also checked while the body streams in.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            Raw request body
+
+        Raises:
+            HTTPException: 413 if the body exceeds max_body_size
+        """
+        limit = self.config.max_body_size
+        chunks = []
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Request body exceeds {limit} bytes",
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _build_slot_collector(
+        message_paths: List[str],
+    ) -> Callable[[Dict], List[Tuple[Dict, str]]]:
+        """
+        Build a function locating the message text fields of a request body.
+
+        Built once per provider so the per-request walk needs no config
+        lookups.
+
+        Args:
+            message_paths: Top-level fields that may hold messages
+
+        Returns:
+            Function returning (container, key) slots holding message text
+        """
+        paths = tuple(message_paths)
+
+        def collect(body: Dict) -> List[Tuple[Dict, str]]:
+            if not isinstance(body, dict):
+                return []
+
+            slots = []
+            for path in paths:
+                content = body.get(path)
+
+                # Handle different message formats
+                if type(content) is str:
+                    slots.append((body, path))
+                elif type(content) is list:
+                    # Handle chat messages
+                    slots.extend(
+                        (message, "content")
+                        for message in content
+                        if type(message) is dict
+                        and type(message.get("content")) is str
+                    )
+            return slots
+
+        return collect
+
     def _anonymize_request_body(
         self,
         body: Dict,
-        provider_config: Dict,
+        provider: str,
     ) -> tuple[Dict, Dict[str, str]]:
         """
         Anonymize PII in request body.
 
         Args:
             body: Request body
-            provider_config: Provider configuration
+            provider: Provider name
 
         Returns:
-            Tuple of (anonymized_body, pii_mapping)
+            Tuple of (anonymized_body, pii_mapping); the body is modified
+            in place
         """
-        anonymized_body = body.copy()
-        combined_mapping = {}
+        anonymized_body = body
 
-        # Find and anonymize message fields
-        message_paths = provider_config["message_paths"]
+        # Collect (container, key) slots holding text that may contain PII
+        slots = [
+            (container, key)
+            for container, key in self._slot_collectors[provider](anonymized_body)
+            if self._may_contain_pii(container[key])
+        ]
+        if not slots:
+            return anonymized_body, {}
 
-        for path in message_paths:
-            if path in anonymized_body:
-                content = anonymized_body[path]
+        texts = [container[key] for container, key in slots]
 
-                # Handle different message formats
-                if isinstance(content, str):
-                    anonymized, mapping = self.guard.anonymize(content)
-                    anonymized_body[path] = anonymized
-                    combined_mapping.update(mapping)
+        # Anonymize all messages in one pass; placeholders are numbered
+        # across the whole request, so messages never reuse each other's
+        anonymized, mapping = self.guard.anonymize(
+            self._MESSAGE_SEPARATOR.join(texts)
+        )
+        parts = anonymized.split(self._MESSAGE_SEPARATOR)
 
-                elif isinstance(content, list):
-                    # Handle chat messages
-                    for i, message in enumerate(content):
-                        if isinstance(message, dict) and "content" in message:
-                            anonymized, mapping = self.guard.anonymize(
-                                message["content"]
-                            )
-                            anonymized_body[path][i]["content"] = anonymized
-                            combined_mapping.update(mapping)
+        if len(parts) != len(texts):
+            # A detection swallowed a separator; fall back to per message,
+            # still numbering placeholders across the whole request
+            results = self.guard.batch_anonymize(texts, share_placeholders=True)
+            parts = [part for part, _ in results]
+            mapping = {
+                placeholder: original
+                for _, part_mapping in results
+                for placeholder, original in part_mapping.items()
+            }
+
+        for (container, key), part in zip(slots, parts):
+            container[key] = part
 
-        return anonymized_body, combined_mapping
+        return anonymized_body, mapping
+
+    def _may_contain_pii(self, content) -> bool:
+        """
+        Check whether content could contain PII detectable by the guard.
+
+        Args:
+            content: Message content
+
+        Returns:
+            False only when the content definitely contains no PII
+        """
+        if self._pii_hint is None or not isinstance(content, str):
+            return True
+        return self._pii_hint.search(content) is not None
 
     def _deanonymize_response_body(
         self,
@@ -333,44 +617,26 @@ class LLMProxy:
         Returns:
             De-anonymized response body
         """
-        deanonymized_body = body.copy()
-
-        # Common response paths
-        response_paths = [
-            ["choices", 0, "message", "content"],
-            ["choices", 0, "text"],
-            ["content", 0, "text"],
-            ["completion"],
-        ]
-
-        for path in response_paths:
+        # A response has exactly one shape, so the first path found wins
+        paths = provider_config["response_content_paths"]
+        for *parent_path, content_key in paths:
             try:
-                # Navigate to the content
-                current = deanonymized_body
-                for key in path[:-1]:
-                    if isinstance(current, list):
-                        current = current[key]
-                    elif isinstance(current, dict) and key in current:
-                        current = current[key]
-                    else:
-                        break
-                else:
-                    # De-anonymize if we found the content
-                    final_key = path[-1]
-                    if isinstance(current, dict) and final_key in current:
-                        current[final_key] = self.guard.deanonymize(
-                            current[final_key], mapping
-                        )
+                parent = reduce(operator.getitem, parent_path, body)
+                content = parent[content_key]
             except (KeyError, IndexError, TypeError):
                 continue
 
-        return deanonymized_body
+            if isinstance(content, str):
+                parent[content_key] = self.guard.deanonymize(content, mapping)
+            break
+
+        return body
 
     async def _handle_streaming_response(
         self,
         response: httpx.Response,
         mapping: Dict[str, str],
-        session_id: str,
+        session_id: Optional[str],
     ) -> StreamingResponse:
         """
         Handle streaming LLM responses.
@@ -378,48 +644,167 @@ class LLMProxy:
         Args:
             response: Upstream response
             mapping: PII mapping
-            session_id: Session identifier
+            session_id: Session identifier (None when no PII was found)
 
         Returns:
             Streaming response
         """
+        # The guard caches the compiled placeholder pattern per mapping, so
+        # every chunk of the stream reuses it
+        deanonymize = self.guard.deanonymize
+
+        # Placeholders are plain ASCII, so they appear verbatim in the raw
+        # JSON; frames without any are forwarded without a parse/serialize
+        placeholder_bytes = (
+            re.compile(
+                b"|".join(
+                    re.escape(k.encode())
+                    for k in sorted(mapping, key=len, reverse=True)
+                )
+            )
+            if mapping
+            else None
+        )
+
+        def process_frame(frame: bytes) -> bytes:
+            """De-anonymize one complete SSE frame (without its terminator)."""
+            if placeholder_bytes is None or not placeholder_bytes.search(frame):
+                return frame
+
+            lines = frame.split(b"\n")
+            for i, line in enumerate(lines):
+                if not line.startswith(b"data: "):
+                    continue
+                try:
+                    data = orjson.loads(line[6:])
+                except orjson.JSONDecodeError:
+                    continue
+
+                # De-anonymize content in chunk
+                if isinstance(data, dict) and "choices" in data:
+                    for choice in data["choices"]:
+                        if "delta" in choice and "content" in choice["delta"]:
+                            content = choice["delta"]["content"]
+                            if isinstance(content, str):
+                                choice["delta"]["content"] = deanonymize(
+                                    content, mapping
+                                )
+
+                lines[i] = b"data: " + orjson.dumps(data)
+            return b"\n".join(lines)
+
         async def stream_generator():
-            async for chunk in response.aiter_bytes():
-                # Parse SSE chunk
-                if chunk.startswith(b"data: "):
-                    try:
-                        data = json.loads(chunk[6:])
-
-                        # De-anonymize content in chunk
-                        if "choices" in data:
-                            for choice in data["choices"]:
-                                if "delta" in choice and "content" in choice["delta"]:
-                                    content = choice["delta"]["content"]
-                                    choice["delta"]["content"] = self.guard.deanonymize(
-                                        content, mapping
-                                    )
-
-                        yield b"data: " + json.dumps(data).encode() + b"\n\n"
-                    except json.JSONDecodeError:
-                        yield chunk
-                else:
-                    yield chunk
+            # Network chunks do not line up with SSE frames, so frames are
+            # reassembled from a rolling buffer before being processed
+            buf = bytearray()
+            try:
+                async for chunk in response.aiter_bytes():
+                    buf += chunk
+                    end = buf.rfind(b"\n\n")
+                    if end == -1:
+                        continue
+
+                    # Take every complete frame at once; if none of them
+                    # holds a placeholder they are forwarded as one block
+                    # without being split apart
+                    block = bytes(buf[: end + 2])
+                    del buf[: end + 2]
+                    if placeholder_bytes is None or not placeholder_bytes.search(block):
+                        yield block
+                        continue
+
+                    yield b"".join(
+                        process_frame(frame) + b"\n\n"
+                        for frame in block[:-2].split(b"\n\n")
+                    )
+
+                # Flush a trailing frame that was not terminated
+                if buf:
+                    yield process_frame(bytes(buf))
+            finally:
+                await response.aclose()
 
         return StreamingResponse(
             stream_generator(),
             media_type="text/event-stream",
-            headers=dict(response.headers),
+            status_code=response.status_code,
+            headers=self._response_headers(response),
+        )
+
+    @staticmethod
+    def _response_headers(response: httpx.Response) -> Dict[str, str]:
+        """
+        Get upstream headers that are safe to forward.
+
+        httpx decodes the body and the proxy may rewrite it, so the upstream
+        framing and encoding headers no longer describe what is sent.
+
+        Args:
+            response: Upstream response
+
+        Returns:
+            Headers for the proxied response
+        """
+        return {
+            key: value
+            for key, value in response.headers.items()
+            if key.lower() not in _UNFORWARDED_RESPONSE_HEADERS
+        }
+
+    @cached_property
+    def guard(self) -> PromptGuard:
+        """
+        PII guard, built on first use.
+
+        Detector construction (e.g. loading ML models) happens inside each
+        worker rather than when the proxy object is created.
+        """
+        return PromptGuard(
+            detectors=self._detectors,
+            policy=self.config.policy,
         )
 
+    async def aclose(self) -> None:
+        """Close the upstream HTTP client and the rate limiters' Redis pool."""
+        await self.http.aclose()
+        if self._redis is not None:
+            # A client given an explicit pool does not disconnect it
+            await self._redis.aclose()
+            await self._redis.connection_pool.disconnect()
+
     def get_metrics(self) -> Dict:
         """Get proxy metrics."""
+        totals = {name: 0 for name in _METRIC_NAMES}
+        counter_to_name = {v: k for k, v in _METRIC_NAMES.items()}
+        for family in get_metrics_registry().collect():
+            name = counter_to_name.get(family.name)
+            if name is None:
+                continue
+            for sample in family.samples:
+                if sample.name.endswith("_total"):
+                    totals[name] += int(sample.value)
+
         return {
-            **self.metrics,
-            "storage_health": self.storage.health_check(),
+            **totals,
+            "storage_health": self._storage_health(),
             "rate_limiting_enabled": self.rate_limiter is not None,
         }
+
+    def _storage_health(self) -> Dict:
+        """
+        Get storage health, cached for STORAGE_HEALTH_TTL seconds.
+
+        Returns:
+            Result of the storage health check
+        """
+        now = time.monotonic()
+        checked_at, health = self._storage_health_cache
+        if health is None or now - checked_at >= STORAGE_HEALTH_TTL:
+            health = self.storage.health_check()
+            self._storage_health_cache = (now, health)
+        return health
     
-    def get_rate_limit_status(
+    async def get_rate_limit_status(
         self,
         client_ip: str,
         user_id: Optional[str] = None,
@@ -439,7 +824,7 @@ class LLMProxy:
         
         return {
             "rate_limiting": "enabled",
-            **self.rate_limiter.get_remaining(client_ip, user_id),
+            **(await self.rate_limiter.get_remaining(client_ip, user_id)),
         }
 
 
@@ -463,6 +848,19 @@ app.add_middleware(
 proxy: Optional[LLMProxy] = None
 
 
+@app.middleware("http")
+async def limit_body_size(request: Request, call_next):
+    """Reject requests whose declared Content-Length exceeds the limit."""
+    limit = proxy.config.max_body_size if proxy else MAX_BODY_SIZE
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds {limit} bytes"},
+        )
+    return await call_next(request)
+
+
 def get_proxy() -> LLMProxy:
     """Get the global proxy instance."""
     if proxy is None:
@@ -474,8 +872,12 @@ def get_proxy() -> LLMProxy:
 async def startup():
     """Initialize proxy on startup."""
     global proxy
-    config = ProxyConfig()  # Load from environment or config file
+    config = ProxyConfig.from_env()
     proxy = LLMProxy(config)
+    # Build the guard now so the first request does not pay for it
+    proxy.guard
+    # Register the counters so they are scraped before the first request
+    _metrics()
     logger.info(
         "Proxy initialized successfully",
         port=config.port,
@@ -485,6 +887,13 @@ async def startup():
     )
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release upstream connections on shutdown."""
+    if proxy is not None:
+        await proxy.aclose()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -492,9 +901,19 @@ async def health_check():
 
 
 @app.get("/metrics")
-async def metrics(proxy: LLMProxy = Depends(get_proxy)):
-    """Get proxy metrics."""
-    return proxy.get_metrics()
+async def metrics():
+    """Expose proxy metrics in Prometheus text format."""
+    return Response(
+        content=generate_latest(get_metrics_registry()),
+        media_type=CONTENT_TYPE_LATEST,
+    )
+
+
+@app.get("/metrics/json")
+async def metrics_json(proxy: LLMProxy = Depends(get_proxy)):
+    """Get proxy metrics as JSON."""
+    # The storage health check is a blocking Redis call
+    return await asyncio.to_thread(proxy.get_metrics)
 
 
 @app.get("/ratelimit/status")
@@ -505,7 +924,7 @@ async def rate_limit_status(
     """Get rate limit status for the current client."""
     client_ip = request.client.host if request.client else "unknown"
     user_id = request.headers.get("X-User-ID")
-    return proxy.get_rate_limit_status(client_ip, user_id)
+    return await proxy.get_rate_limit_status(client_ip, user_id)
 
 
 @app.api_route("/openai/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -530,40 +949,88 @@ async def anthropic_proxy(
 
 if __name__ == "__main__":
     import argparse
+    import tempfile
+
+    defaults = ProxyConfig.from_env()
 
     parser = argparse.ArgumentParser(description="LLM PII Protection Proxy")
-    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
-    parser.add_argument("--host", type=str, default="0.0.0.0", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=defaults.port, help="Port to listen on")
+    parser.add_argument("--host", type=str, default=defaults.host, help="Host to bind to")
     parser.add_argument(
         "--redis-url",
         type=str,
-        default="redis://localhost:6379",
+        default=defaults.redis_url,
         help="Redis URL for session storage",
     )
     parser.add_argument(
         "--policy",
         type=str,
-        default="default_pii",
+        default=defaults.policy,
         help="PII protection policy to use",
     )
+    parser.add_argument(
+        "--max-body-size",
+        type=int,
+        default=defaults.max_body_size,
+        help="Maximum request body size in bytes",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WORKERS", os.cpu_count() or 1)),
+        help="Number of worker processes (defaults to CPU count)",
+    )
+    parser.add_argument(
+        "--redis-max-connections",
+        type=int,
+        default=defaults.redis_max_connections,
+        help="Redis connections each worker's rate limiter may open",
+    )
+    parser.add_argument(
+        "--rate-limit-shards",
+        type=int,
+        default=defaults.rate_limit_shards,
+        help="Redis keys each rate limit bucket is split over",
+    )
+    parser.add_argument(
+        "--global-limit-batch-size",
+        type=int,
+        default=defaults.global_limit_batch_size,
+        help="Requests each worker counts locally before updating the global limit",
+    )
 
     args = parser.parse_args()
 
-    # Update global config
-    config = ProxyConfig(
-        port=args.port,
-        host=args.host,
-        redis_url=args.redis_url,
-        policy=args.policy,
-    )
-
-    # Initialize proxy
-    proxy = LLMProxy(config)
+    # Each worker writes its own metric files; /metrics aggregates them
+    if args.workers > 1:
+        os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR",
+            tempfile.mkdtemp(prefix="prompt-guard-metrics-"),
+        )
 
-    # Run server
+    # Workers build their own LLMProxy on startup from the environment,
+    # so pass the command-line settings down that way. Redis holds all
+    # shared state, so adding workers does not split sessions or limits.
+    os.environ.update({
+        "PORT": str(args.port),
+        "HOST": args.host,
+        "REDIS_URL": args.redis_url,
+        "POLICY": args.policy,
+        "MAX_BODY_SIZE": str(args.max_body_size),
+        "WORKERS": str(args.workers),
+        "REDIS_MAX_CONNECTIONS": str(args.redis_max_connections),
+        "RATE_LIMIT_SHARDS": str(args.rate_limit_shards),
+        "GLOBAL_LIMIT_BATCH_SIZE": str(args.global_limit_batch_size),
+    })
+
+    # Run server on uvloop/httptools (both installed by uvicorn[standard])
     uvicorn.run(
-        app,
-        host=config.host,
-        port=config.port,
+        "main:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
         log_level="info",
     )
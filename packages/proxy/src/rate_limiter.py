@@ -3,10 +3,11 @@ Rate limiting implementation using token bucket algorithm with Redis backend.
 """
 
 import time
+import random
 import hashlib
-from typing import Optional, Set
+from typing import List, Optional, Set
 from dataclasses import dataclass
-import redis
+import redis.asyncio as redis
 
 
 @dataclass
@@ -16,6 +17,11 @@ class RateLimitConfig:
     requests_per_hour: int = 1000
     burst_size: int = 10  # Allow burst requests
     trusted_ips: Set[str] = None  # IPs that bypass rate limiting
+    # Split each bucket over this many Redis keys (each holding an equal
+    # share of the limits plus the full burst) so one hot identifier does
+    # not serialize on a single key. Limits become approximate when greater
+    # than 1.
+    shards: int = 1
     
     def __post_init__(self):
         if self.trusted_ips is None:
@@ -32,6 +38,67 @@ class RateLimitExceeded(Exception):
         )
 
 
+# Counts the request against the global per-second limit (when enabled), then
+# checks the minute and hour windows atomically and consumes one request from
+# both only when neither is exhausted. Both windows live in one hash per
+# identifier with fields m_count/m_start and h_count/h_start.
+#
+# KEYS: identifier key, global per-second key
+# ARGV: now, burst, minute max, hour max, global max (0 disables),
+#       check windows (0 for trusted clients), global increment (0 skips)
+# Returns: {allowed, retry_after, exhausted limit (1 minute, 2 hour, 3 global)}
+_CHECK_WINDOWS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local global_max = tonumber(ARGV[5])
+local global_incr = tonumber(ARGV[7])
+
+if global_max > 0 and global_incr > 0 then
+    local count = redis.call('INCRBY', KEYS[2], global_incr)
+    redis.call('EXPIRE', KEYS[2], 2)
+    if count > global_max then
+        return {0, 1, 3}
+    end
+end
+
+if ARGV[6] == '0' then
+    return {1, 0, 0}
+end
+
+local prefixes = {'m_', 'h_'}
+local seconds = {60, 3600}
+local state = redis.call('HMGET', KEYS[1], 'm_count', 'm_start', 'h_count', 'h_start')
+local reset = {}
+
+for i = 1, 2 do
+    local max_requests = tonumber(ARGV[2 + i])
+    local count = tonumber(state[2 * i - 1]) or 0
+    local start = tonumber(state[2 * i])
+
+    if start == nil or now - start >= seconds[i] then
+        reset[i] = true
+    elseif count >= max_requests + burst then
+        return {0, math.floor(seconds[i] - (now - start)), i}
+    end
+end
+
+for i = 1, 2 do
+    if reset[i] then
+        redis.call('HSET', KEYS[1], prefixes[i] .. 'count', 1, prefixes[i] .. 'start', ARGV[1])
+    else
+        redis.call('HINCRBY', KEYS[1], prefixes[i] .. 'count', 1)
+    end
+end
+
+-- The hour window outlives the minute one, so it bounds the key's lifetime
+if reset[2] then
+    redis.call('EXPIRE', KEYS[1], seconds[2])
+end
+
+return {1, 0, 0}
+"""
+
+
 class TokenBucketRateLimiter:
     """
     Token bucket rate limiter with Redis backend.
@@ -60,26 +127,42 @@ class TokenBucketRateLimiter:
         """
         self.redis = redis_client
         self.config = config
+        self._check_windows = redis_client.register_script(_CHECK_WINDOWS_SCRIPT)
+        # Script arguments fixed by the config, resolved once
+        self._trusted_ips = frozenset(config.trusted_ips)
+        self._shards = max(1, config.shards)
+        self._window_args = (
+            config.burst_size,
+            self._per_shard(config.requests_per_minute),
+            self._per_shard(config.requests_per_hour),
+        )
+
+    def _per_shard(self, limit: int) -> int:
+        """Get one shard's share of a limit (rounded up)."""
+        return -(-limit // self._shards)
         
-    def _get_key(self, identifier: str, window: str) -> str:
+    def _get_keys(self, identifier: str) -> List[str]:
         """
-        Generate Redis key for rate limit tracking.
+        Generate Redis keys for rate limit tracking.
         
         Args:
             identifier: IP address or user ID
-            window: Time window ('minute' or 'hour')
         
         Returns:
-            Redis key
+            Redis keys holding both windows, one per shard
         """
-        # Hash the identifier for privacy
-        hashed = hashlib.sha256(identifier.encode()).hexdigest()[:16]
-        return f"ratelimit:{window}:{hashed}"
+        # Hash the identifier for privacy (blake2b is faster than sha256 and
+        # yields the same 16 hex chars directly)
+        hashed = hashlib.blake2b(identifier.encode(), digest_size=8).hexdigest()
+        if self._shards == 1:
+            return [f"ratelimit:{hashed}"]
+        return [f"ratelimit:{hashed}:{shard}" for shard in range(self._shards)]
     
-    def check_rate_limit(
+    async def check_rate_limit(
         self,
         client_ip: str,
         user_id: Optional[str] = None,
+        global_limiter: Optional["GlobalRateLimiter"] = None,
     ) -> None:
         """
         Check if request is within rate limits.
@@ -87,90 +170,53 @@ class TokenBucketRateLimiter:
         Args:
             client_ip: Client IP address
             user_id: Optional user identifier
+            global_limiter: Optional global limiter checked in the same
+                round trip (applies to trusted IPs too)
         
         Raises:
             RateLimitExceeded: If rate limit is exceeded
         """
-        # Check if IP is trusted
-        if client_ip in self.config.trusted_ips:
+        # Trusted IPs bypass the per-client windows
+        trusted = client_ip in self._trusted_ips
+        if trusted and global_limiter is None:
             return
         
         # Determine identifier (prefer user_id over IP)
         identifier = user_id if user_id else client_ip
-        
-        # Check per-minute limit
-        self._check_window(
-            identifier,
-            "minute",
-            self.config.requests_per_minute,
-            60,
-        )
-        
-        # Check per-hour limit
-        self._check_window(
-            identifier,
-            "hour",
-            self.config.requests_per_hour,
-            3600,
-        )
-    
-    def _check_window(
-        self,
-        identifier: str,
-        window: str,
-        max_requests: int,
-        window_seconds: int,
-    ) -> None:
-        """
-        Check rate limit for a specific time window.
-        
-        Args:
-            identifier: IP or user ID
-            window: Window name ('minute' or 'hour')
-            max_requests: Maximum requests allowed in window
-            window_seconds: Window duration in seconds
-        
-        Raises:
-            RateLimitExceeded: If limit exceeded
-        """
-        key = self._get_key(identifier, window)
         current_time = time.time()
         
-        # Get current request count and window start
-        pipe = self.redis.pipeline()
-        pipe.get(f"{key}:count")
-        pipe.get(f"{key}:start")
-        results = pipe.execute()
-        
-        current_count = int(results[0]) if results[0] else 0
-        window_start = float(results[1]) if results[1] else current_time
-        
-        # Check if window has expired
-        if current_time - window_start >= window_seconds:
-            # Reset window
-            pipe = self.redis.pipeline()
-            pipe.set(f"{key}:count", 1, ex=window_seconds)
-            pipe.set(f"{key}:start", current_time, ex=window_seconds)
-            pipe.execute()
+        # Count locally first; the shared counter is updated in batches
+        global_incr = global_limiter.take(current_time) if global_limiter else 0
+        if trusted and not global_incr:
             return
         
-        # Check if burst allowance can be used
-        if current_count < max_requests + self.config.burst_size:
-            # Increment counter
-            pipe = self.redis.pipeline()
-            pipe.incr(f"{key}:count")
-            pipe.expire(f"{key}:count", window_seconds)
-            pipe.execute()
-            return
+        # Each request is counted against one randomly chosen shard
+        shard = random.randrange(self._shards) if self._shards > 1 else None
         
-        # Rate limit exceeded
-        time_remaining = int(window_seconds - (current_time - window_start))
-        raise RateLimitExceeded(
-            retry_after=time_remaining,
-            limit_type=window,
+        # Check the global limit and both windows in a single round trip
+        allowed, retry_after, exceeded = await self._check_windows(
+            keys=[
+                self._get_keys(identifier)[shard or 0],
+                GlobalRateLimiter.get_key(current_time, shard),
+            ],
+            args=[
+                current_time,
+                *self._window_args,
+                self._per_shard(global_limiter.max_requests) if global_limiter else 0,
+                0 if trusted else 1,
+                global_incr,
+            ],
         )
+
+        if not allowed:
+            if exceeded == 3:
+                global_limiter.mark_exhausted()
+            raise RateLimitExceeded(
+                retry_after=int(retry_after),
+                limit_type=("minute", "hour", "global")[int(exceeded) - 1],
+            )
     
-    def get_remaining(
+    async def get_remaining(
         self,
         client_ip: str,
         user_id: Optional[str] = None,
@@ -187,16 +233,19 @@ class TokenBucketRateLimiter:
         """
         identifier = user_id if user_id else client_ip
         
-        minute_key = self._get_key(identifier, "minute")
-        hour_key = self._get_key(identifier, "hour")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in self._get_keys(identifier):
+                pipe.hmget(key, "m_count", "m_start", "h_count")
+            shard_states = await pipe.execute()
         
-        pipe = self.redis.pipeline()
-        pipe.get(f"{minute_key}:count")
-        pipe.get(f"{hour_key}:count")
-        results = pipe.execute()
-        
-        minute_count = int(results[0]) if results[0] else 0
-        hour_count = int(results[1]) if results[1] else 0
+        now = time.time()
+        minute_count = 0
+        hour_count = 0
+        for m_count, m_start, h_count in shard_states:
+            # The minute fields outlive their window inside the hour-long key
+            if m_count and not (m_start and now - float(m_start) >= 60):
+                minute_count += int(m_count)
+            hour_count += int(h_count) if h_count else 0
         
         return {
             "minute": {
@@ -211,16 +260,14 @@ class TokenBucketRateLimiter:
             },
         }
     
-    def reset(self, identifier: str) -> None:
+    async def reset(self, identifier: str) -> None:
         """
         Reset rate limit for an identifier (admin function).
         
         Args:
             identifier: IP address or user ID to reset
         """
-        for window in ["minute", "hour"]:
-            key = self._get_key(identifier, window)
-            self.redis.delete(f"{key}:count", f"{key}:start")
+        await self.redis.delete(*self._get_keys(identifier))
 
 
 class GlobalRateLimiter:
@@ -234,6 +281,7 @@ class GlobalRateLimiter:
         self,
         redis_client: redis.Redis,
         max_requests_per_second: int = 100,
+        batch_size: int = 1,
     ):
         """
         Initialize global rate limiter.
@@ -241,27 +289,89 @@ class GlobalRateLimiter:
         Args:
             redis_client: Redis client
             max_requests_per_second: Maximum global requests per second
+            batch_size: Requests counted locally before they are added to
+                the shared Redis counter. Values above 1 take the counter
+                off most requests' path, at the cost of admitting up to
+                batch_size - 1 extra requests per process each second.
         """
         self.redis = redis_client
         self.max_requests = max_requests_per_second
+        self.batch_size = max(1, batch_size)
+        # Local state for the current second
+        self._second = None
+        self._pending = 0
+        self._exhausted = False
     
-    def check_global_limit(self) -> None:
+    def take(self, current_time: float) -> int:
+        """
+        Count a request locally.
+        
+        Args:
+            current_time: Unix timestamp of the request
+        
+        Returns:
+            Number of requests to add to the shared counter now (0 while
+            the batch is still filling)
+        
+        Raises:
+            RateLimitExceeded: If this process already saw the limit
+                exhausted during the current second
+        """
+        second = int(current_time)
+        if second != self._second:
+            self._second = second
+            self._pending = 0
+            self._exhausted = False
+        
+        if self._exhausted:
+            raise RateLimitExceeded(retry_after=1, limit_type="global")
+        
+        self._pending += 1
+        if self._pending < self.batch_size:
+            return 0
+        
+        pending, self._pending = self._pending, 0
+        return pending
+    
+    def mark_exhausted(self) -> None:
+        """Reject further requests locally until the current second ends."""
+        self._exhausted = True
+    
+    @staticmethod
+    def get_key(current_time: float, shard: Optional[int] = None) -> str:
+        """
+        Get the Redis counter key for the second containing a timestamp.
+        
+        Args:
+            current_time: Unix timestamp
+            shard: Optional shard of a split counter
+        
+        Returns:
+            Redis key
+        """
+        key = f"ratelimit:global:second:{int(current_time)}"
+        return key if shard is None else f"{key}:{shard}"
+    
+    async def check_global_limit(self) -> None:
         """
         Check global rate limit.
         
         Raises:
             RateLimitExceeded: If global limit exceeded
         """
-        key = "ratelimit:global:second"
-        current_time = int(time.time())
-        
-        # Use current second as key
-        second_key = f"{key}:{current_time}"
+        current_time = time.time()
+        increment = self.take(current_time)
+        if not increment:
+            return
         
-        count = self.redis.incr(second_key)
-        self.redis.expire(second_key, 2)  # Keep for 2 seconds
+        second_key = self.get_key(current_time)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incrby(second_key, increment)
+            pipe.expire(second_key, 2)  # Keep for 2 seconds
+            count, _ = await pipe.execute()
         
         if count > self.max_requests:
+            self.mark_exhausted()
             raise RateLimitExceeded(
                 retry_after=1,
                 limit_type="global",
@@ -0,0 +1,221 @@
+"""
+Tests for the HTTP proxy server.
+"""
+
+import importlib
+import runpy
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("orjson")
+pytest.importorskip("prometheus_client")
+pytest.importorskip("redis")
+uvicorn = pytest.importorskip("uvicorn")
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import main  # noqa: E402
+
+# Environment variables read by ProxyConfig.from_env
+ENV_NAMES = (
+    "PORT",
+    "HOST",
+    "REDIS_URL",
+    "POLICY",
+    "DETECTORS",
+    "MAX_BODY_SIZE",
+    "WORKERS",
+    "REDIS_MAX_CONNECTIONS",
+    "RATE_LIMIT_SHARDS",
+    "GLOBAL_LIMIT_BATCH_SIZE",
+)
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Unset the proxy's environment variables, restoring them afterwards."""
+    for name in ENV_NAMES:
+        # setenv first so the variable is removed again on teardown
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    return monkeypatch
+
+
+class TestEntryPoint:
+    """Test importing and launching the proxy."""
+
+    def test_import_and_run_as_script(self, clean_env):
+        """Running main.py and importing "main:app" must not clash."""
+        launched = {}
+
+        def fake_run(app, **kwargs):
+            # uvicorn imports the app module by name, as a worker would
+            module_name, attr = app.split(":")
+            launched["app"] = getattr(importlib.import_module(module_name), attr)
+            launched["kwargs"] = kwargs
+
+        clean_env.setattr(uvicorn, "run", fake_run)
+        clean_env.setattr(
+            sys,
+            "argv",
+            [
+                "main.py",
+                "--port",
+                "9000",
+                "--workers",
+                "1",
+                "--redis-max-connections",
+                "64",
+                "--rate-limit-shards",
+                "4",
+                "--global-limit-batch-size",
+                "16",
+            ],
+        )
+
+        runpy.run_path(str(SRC_DIR / "main.py"), run_name="__main__")
+
+        assert launched["app"] is main.app
+        assert launched["kwargs"]["port"] == 9000
+        # Workers read their settings back from the environment
+        config = main.ProxyConfig.from_env()
+        assert config.redis_max_connections == 64
+        assert config.rate_limit_shards == 4
+        assert config.global_limit_batch_size == 16
+
+    def test_from_env_rate_limiting(self, clean_env):
+        """Rate limiting knobs are read from the environment."""
+        clean_env.setenv("REDIS_MAX_CONNECTIONS", "128")
+        clean_env.setenv("RATE_LIMIT_SHARDS", "8")
+        clean_env.setenv("GLOBAL_LIMIT_BATCH_SIZE", "32")
+
+        config = main.ProxyConfig.from_env()
+
+        assert config.redis_max_connections == 128
+        assert config.rate_limit_shards == 8
+        assert config.global_limit_batch_size == 32
+
+    def test_metrics_registered_once(self):
+        """Counters are created on first use and then reused."""
+        assert main._metrics() is main._metrics()
+
+
+@pytest.fixture
+def proxy():
+    """Proxy without Redis connections, for exercising body handling."""
+    from prompt_guard import PromptGuard
+
+    proxy = main.LLMProxy.__new__(main.LLMProxy)
+    proxy.__dict__["guard"] = PromptGuard()
+    proxy._pii_hint = None
+    proxy._slot_collectors = {
+        name: proxy._build_slot_collector(provider_config["message_paths"])
+        for name, provider_config in proxy.PROVIDERS.items()
+    }
+    return proxy
+
+
+class TestRequestAnonymization:
+    """Test anonymizing the messages of a request body."""
+
+    def test_messages_share_placeholder_numbering(self, proxy):
+        """Different values in different messages get different placeholders."""
+        body = {
+            "messages": [
+                {"role": "user", "content": "Mail john@example.com"},
+                {"role": "user", "content": "Mail jane@example.com"},
+            ]
+        }
+
+        body, mapping = proxy._anonymize_request_body(body, "openai")
+
+        assert [m["content"] for m in body["messages"]] == ["Mail [EMAIL_1]", "Mail [EMAIL_2]"]
+        assert mapping == {"[EMAIL_1]": "john@example.com", "[EMAIL_2]": "jane@example.com"}
+
+    def test_fallback_keeps_placeholders_distinct(self, proxy, monkeypatch):
+        """The per-message fallback numbers placeholders across the request."""
+        # Simulate a detection swallowing the message separator
+        monkeypatch.setattr(proxy.guard, "anonymize", lambda text: ("[SWALLOWED]", {}))
+        body = {
+            "messages": [
+                {"role": "user", "content": "Mail john@example.com"},
+                {"role": "user", "content": "Mail jane@example.com"},
+            ]
+        }
+
+        body, mapping = proxy._anonymize_request_body(body, "openai")
+
+        assert [m["content"] for m in body["messages"]] == ["Mail [EMAIL_1]", "Mail [EMAIL_2]"]
+        assert mapping == {"[EMAIL_1]": "john@example.com", "[EMAIL_2]": "jane@example.com"}
+
+
+class TestResponseDeanonymization:
+    """Test restoring PII in each provider response shape."""
+
+    MAPPING = {"[EMAIL_1]": "john@example.com"}
+
+    @pytest.mark.parametrize(
+        "provider,body,path",
+        [
+            (
+                "openai",
+                {"choices": [{"message": {"content": "Mail [EMAIL_1]"}}]},
+                ("choices", 0, "message", "content"),
+            ),
+            (
+                "openai",
+                {"choices": [{"text": "Mail [EMAIL_1]"}]},
+                ("choices", 0, "text"),
+            ),
+            (
+                "anthropic",
+                {"content": [{"type": "text", "text": "Mail [EMAIL_1]"}]},
+                ("content", 0, "text"),
+            ),
+            (
+                "anthropic",
+                {"completion": "Mail [EMAIL_1]"},
+                ("completion",),
+            ),
+        ],
+        ids=["chat", "completions", "messages", "legacy-completion"],
+    )
+    def test_response_shapes(self, proxy, provider, body, path):
+        """Content is restored wherever the provider's response puts it."""
+        result = proxy._deanonymize_response_body(body, self.MAPPING, proxy.PROVIDERS[provider])
+
+        content = result
+        for key in path:
+            content = content[key]
+        assert content == "Mail john@example.com"
+
+    def test_unknown_shape_unchanged(self, proxy):
+        """Bodies without a known content path are returned as is."""
+        body = {"error": {"message": "[EMAIL_1]"}}
+
+        result = proxy._deanonymize_response_body(body, self.MAPPING, proxy.PROVIDERS["openai"])
+
+        assert result == {"error": {"message": "[EMAIL_1]"}}
+
+
+class TestRateLimiterPool:
+    """Test the Redis connection pool used by the rate limiters."""
+
+    def test_pool_waits_for_connections(self, monkeypatch):
+        """A busy pool makes checks wait rather than fail with too many connections."""
+        pytest.importorskip("h2")
+        import redis.asyncio as aioredis
+
+        monkeypatch.setattr(main, "RedisMappingStorage", Mock())
+        proxy = main.LLMProxy(main.ProxyConfig(redis_max_connections=8))
+
+        pool = proxy._redis.connection_pool
+        assert isinstance(pool, aioredis.BlockingConnectionPool)
+        assert pool.max_connections == 8
+        assert pool.timeout == main.REDIS_POOL_TIMEOUT
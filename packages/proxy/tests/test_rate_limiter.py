@@ -0,0 +1,123 @@
+"""
+Tests for the proxy's Redis-backed rate limiters.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+pytest.importorskip("redis")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import rate_limiter  # noqa: E402
+from rate_limiter import (  # noqa: E402
+    GlobalRateLimiter,
+    RateLimitConfig,
+    RateLimitExceeded,
+    TokenBucketRateLimiter,
+)
+
+
+def make_limiter(result=(1, 0, 0), **config):
+    """Build a limiter whose Lua script is a mock returning ``result``."""
+    redis_client = Mock()
+    redis_client.register_script.return_value = AsyncMock(return_value=list(result))
+    return TokenBucketRateLimiter(redis_client, RateLimitConfig(**config))
+
+
+class TestShardedRateLimit:
+    """Test splitting each bucket over several Redis keys."""
+
+    @pytest.mark.asyncio
+    async def test_check_rate_limit_uses_one_shard(self, monkeypatch):
+        """A request is counted against one shard holding its share of the limits."""
+        monkeypatch.setattr(rate_limiter.random, "randrange", lambda n: 2)
+        limiter = make_limiter(
+            requests_per_minute=60, requests_per_hour=1000, burst_size=10, shards=4
+        )
+        global_limiter = GlobalRateLimiter(Mock(), max_requests_per_second=100)
+
+        await limiter.check_rate_limit("10.0.0.1", global_limiter=global_limiter)
+
+        call = limiter._check_windows.await_args
+        identifier_key, global_key = call.kwargs["keys"]
+        assert identifier_key == limiter._get_keys("10.0.0.1")[2]
+        assert identifier_key.endswith(":2")
+        assert global_key.endswith(":2")
+        # Per shard: full burst, a quarter of each window and of the global limit
+        assert call.kwargs["args"][1:5] == [10, 15, 250, 25]
+
+    def test_keys_per_shard(self):
+        """Each identifier has one key per shard."""
+        limiter = make_limiter(shards=3)
+
+        keys = limiter._get_keys("user-1")
+
+        assert len(set(keys)) == 3
+        assert [key.rsplit(":", 1)[1] for key in keys] == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_exhausted_shard_rejects(self):
+        """A shard over its share raises with the exhausted window."""
+        limiter = make_limiter(result=(0, 42, 1), shards=4)
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.check_rate_limit("10.0.0.1")
+
+        assert exc_info.value.limit_type == "minute"
+        assert exc_info.value.retry_after == 42
+
+
+class TestGlobalRateLimiter:
+    """Test the process-local batching of the global limit."""
+
+    def test_take_batches_requests(self):
+        """Requests are added to the shared counter once per full batch."""
+        limiter = GlobalRateLimiter(Mock(), max_requests_per_second=100, batch_size=3)
+
+        increments = [limiter.take(1000.1) for _ in range(7)]
+
+        assert increments == [0, 0, 3, 0, 0, 3, 0]
+
+    def test_take_without_batching(self):
+        """With the default batch size every request hits the counter."""
+        limiter = GlobalRateLimiter(Mock())
+
+        assert [limiter.take(1000.1) for _ in range(3)] == [1, 1, 1]
+
+    def test_take_rolls_over_each_second(self):
+        """A new second drops the requests pending from the previous one."""
+        limiter = GlobalRateLimiter(Mock(), batch_size=3)
+        limiter.take(1000.1)
+        limiter.take(1000.9)
+
+        assert limiter.take(1001.0) == 0
+        assert limiter.take(1001.2) == 0
+        assert limiter.take(1001.5) == 3
+
+    def test_exhausted_rejects_locally_until_next_second(self):
+        """Once exhausted, requests fail without reaching Redis."""
+        limiter = GlobalRateLimiter(Mock(), batch_size=3)
+        limiter.take(1000.1)
+        limiter.mark_exhausted()
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            limiter.take(1000.5)
+        assert exc_info.value.limit_type == "global"
+
+        assert limiter.take(1001.0) == 0
+
+    @pytest.mark.asyncio
+    async def test_global_exhaustion_marks_limiter(self):
+        """A global rejection from Redis stops later requests locally."""
+        limiter = make_limiter(result=(0, 1, 3))
+        global_limiter = GlobalRateLimiter(Mock(), max_requests_per_second=10)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.check_rate_limit("10.0.0.1", global_limiter=global_limiter)
+
+        with pytest.raises(RateLimitExceeded):
+            global_limiter.take(global_limiter._second)
@@ -5,6 +5,9 @@ This package provides policy-driven PII anonymization and de-anonymization
 for Large Language Model (LLM) and Small Language Model (SLM) applications.
 """
 
+import importlib
+import importlib.util
+
 # Core components
 from .guard import PromptGuard
 from .async_guard import AsyncPromptGuard, create_async_guard
@@ -47,18 +50,6 @@ from .anonymizers.base import AnonymizationStrategy, BaseAnonymizer
 from .anonymizers.hash import HashAnonymizer
 from .anonymizers.mask import MaskAnonymizer
 
-try:
-    from .anonymizers.synthetic import SyntheticAnonymizer
-    _SYNTHETIC_AVAILABLE = True
-except ImportError:
-    _SYNTHETIC_AVAILABLE = False
-
-try:
-    from .anonymizers.encrypt import EncryptAnonymizer
-    _ENCRYPT_AVAILABLE = True
-except ImportError:
-    _ENCRYPT_AVAILABLE = False
-
 # Hooks
 from .hooks import (
     HookRegistry,
@@ -75,25 +66,6 @@ from .hooks import (
 # Detectors
 from .detectors import BaseDetector, RegexDetector
 
-# Optional detectors
-try:
-    from .detectors.presidio_detector import PresidioDetector
-    _PRESIDIO_AVAILABLE = True
-except ImportError:
-    _PRESIDIO_AVAILABLE = False
-
-try:
-    from .detectors.enhanced_regex_detector import EnhancedRegexDetector
-    _ENHANCED_REGEX_AVAILABLE = True
-except ImportError:
-    _ENHANCED_REGEX_AVAILABLE = False
-
-try:
-    from .detectors.spacy_detector import SpacyDetector
-    _SPACY_AVAILABLE = True
-except ImportError:
-    _SPACY_AVAILABLE = False
-
 # Caching
 from .cache import (
     CacheBackend,
@@ -103,65 +75,107 @@ from .cache import (
     create_cache_key,
 )
 
-# Storage (optional)
-try:
-    from .storage.redis_storage import RedisMappingStorage
-    _REDIS_STORAGE_AVAILABLE = True
-except ImportError:
-    _REDIS_STORAGE_AVAILABLE = False
-
-try:
-    from .storage.postgres_storage import PostgresAuditLogger
-    _POSTGRES_STORAGE_AVAILABLE = True
-except ImportError:
-    _POSTGRES_STORAGE_AVAILABLE = False
-
-# Adapters (optional)
-try:
-    from .adapters.langchain_adapter import (
-        ProtectedLLM,
-        ProtectedChatLLM,
-        create_protected_llm,
-        create_protected_chat,
-    )
-    _LANGCHAIN_AVAILABLE = True
-except ImportError:
-    _LANGCHAIN_AVAILABLE = False
-
-try:
-    from .adapters.llamaindex_adapter import (
-        ProtectedQueryEngine,
-        ProtectedChatEngine,
-        create_protected_query_engine,
-        create_protected_chat_engine,
-    )
-    _LLAMAINDEX_AVAILABLE = True
-except ImportError:
-    _LLAMAINDEX_AVAILABLE = False
-
-try:
-    from .adapters.vercel_ai_adapter import (
-        VercelAIAdapter,
-        ProtectedStreamingChat,
-        create_protected_vercel_handler,
-        create_protected_streaming_chat,
-    )
-    _VERCEL_AI_AVAILABLE = True
-except ImportError:
-    _VERCEL_AI_AVAILABLE = False
-
-try:
-    from .adapters.huggingface_adapter import (
-        ProtectedPipeline,
-        ProtectedConversational,
-        ProtectedTextGeneration,
-        create_protected_pipeline,
-        create_protected_conversational,
-        create_protected_text_generation,
-    )
-    _HUGGINGFACE_AVAILABLE = True
-except ImportError:
-    _HUGGINGFACE_AVAILABLE = False
+
+def _has_module(*names: str) -> bool:
+    """Check whether modules can be imported, without importing them.
+
+    Dotted names import their parent package, so the check matches the
+    import path an optional component actually uses.
+    """
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):  # Parent package missing or broken
+            return False
+    return True
+
+
+def _has_legacy_llama_index() -> bool:
+    """Check for a pre-0.10 ``llama_index`` that exports classes at top level."""
+    try:
+        spec = importlib.util.find_spec("llama_index")
+    except (ImportError, ValueError):
+        return False
+    # Since 0.10 ``llama_index`` is a namespace package without an origin
+    return spec is not None and spec.origin is not None
+
+
+# Optional components are imported on first attribute access (PEP 562), so
+# `import prompt_guard` does not load adapters, ML detectors or storage
+# drivers. Availability is determined from the third-party modules they import.
+_SYNTHETIC_AVAILABLE = _has_module("faker")
+_ENCRYPT_AVAILABLE = _has_module("cryptography")
+_PRESIDIO_AVAILABLE = _has_module("presidio_analyzer")
+_ENHANCED_REGEX_AVAILABLE = True
+_SPACY_AVAILABLE = _has_module("spacy")
+_REDIS_STORAGE_AVAILABLE = _has_module("redis")
+_POSTGRES_STORAGE_AVAILABLE = _has_module("psycopg2")
+_LANGCHAIN_AVAILABLE = _has_module(
+    "langchain.llms.base", "langchain.schema.runnable", "langchain.callbacks.manager"
+)
+_LLAMAINDEX_AVAILABLE = _has_module("llama_index.core") or _has_legacy_llama_index()
+_VERCEL_AI_AVAILABLE = True
+_HUGGINGFACE_AVAILABLE = _has_module("transformers")
+
+# Lazily imported name -> module defining it
+_LAZY_IMPORTS = {
+    # Anonymization strategies
+    "SyntheticAnonymizer": ".anonymizers.synthetic",
+    "EncryptAnonymizer": ".anonymizers.encrypt",
+    # Detectors
+    "PresidioDetector": ".detectors.presidio_detector",
+    "EnhancedRegexDetector": ".detectors.enhanced_regex_detector",
+    "SpacyDetector": ".detectors.spacy_detector",
+    # Storage
+    "RedisMappingStorage": ".storage.redis_storage",
+    "PostgresAuditLogger": ".storage.postgres_storage",
+    # Adapters
+    "ProtectedLLM": ".adapters.langchain_adapter",
+    "ProtectedChatLLM": ".adapters.langchain_adapter",
+    "ProtectedRunnable": ".adapters.langchain_adapter",
+    "create_protected_llm": ".adapters.langchain_adapter",
+    "create_protected_chat": ".adapters.langchain_adapter",
+    "ProtectedQueryEngine": ".adapters.llamaindex_adapter",
+    "ProtectedChatEngine": ".adapters.llamaindex_adapter",
+    "create_protected_query_engine": ".adapters.llamaindex_adapter",
+    "create_protected_chat_engine": ".adapters.llamaindex_adapter",
+    "VercelAIAdapter": ".adapters.vercel_ai_adapter",
+    "ProtectedStreamingChat": ".adapters.vercel_ai_adapter",
+    "create_protected_vercel_handler": ".adapters.vercel_ai_adapter",
+    "create_protected_streaming_chat": ".adapters.vercel_ai_adapter",
+    "ProtectedPipeline": ".adapters.huggingface_adapter",
+    "ProtectedConversational": ".adapters.huggingface_adapter",
+    "ProtectedTextGeneration": ".adapters.huggingface_adapter",
+    "create_protected_pipeline": ".adapters.huggingface_adapter",
+    "create_protected_conversational": ".adapters.huggingface_adapter",
+    "create_protected_text_generation": ".adapters.huggingface_adapter",
+}
+
+
+def __getattr__(name: str):
+    """Import optional components on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(module_name, __name__)
+    try:
+        value = getattr(module, name)
+    except AttributeError:
+        # Adapter modules only define their classes when the framework
+        # imports cleanly, e.g. not with LangChain releases lacking langchain.llms
+        raise ImportError(
+            f"cannot import name {name!r} from {__name__!r}: "
+            f"optional dependencies of {module.__name__!r} are not installed"
+        ) from None
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __version__ = "1.1.0"
 __author__ = "LLM-SLM-Prompt-Guard Contributors"
@@ -251,6 +265,7 @@ if _LANGCHAIN_AVAILABLE:
     __all__.extend([
         "ProtectedLLM",
         "ProtectedChatLLM",
+        "ProtectedRunnable",
         "create_protected_llm",
         "create_protected_chat",
     ])
@@ -20,12 +20,42 @@ Example:
     >>> # PII is automatically protected!
 """
 
-from typing import Any, Dict, List, Optional, Union, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Event, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, Callable
 import logging
+import weakref
+
+from ..guard import _stream_safe_end
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _conversation_class() -> Any:
+    """Import ``transformers.Conversation`` on first use only."""
+    from transformers import Conversation
+
+    return Conversation
+
+
+@lru_cache(maxsize=None)
+def _event_stopping_criteria_class() -> Any:
+    """Build a ``StoppingCriteria`` that stops once an event is set."""
+    from transformers import StoppingCriteria
+
+    class EventStoppingCriteria(StoppingCriteria):
+        def __init__(self, event: Event):
+            self.event = event
+
+        def __call__(self, input_ids: Any, scores: Any, **kwargs) -> bool:
+            return self.event.is_set()
+
+    return EventStoppingCriteria
+
+
 class ProtectedPipeline:
     """
     Protected Hugging Face pipeline wrapper.
@@ -50,6 +80,7 @@ class ProtectedPipeline:
         guard: Any,
         deanonymize_output: bool = True,
         store_mapping: bool = False,
+        max_workers: Optional[int] = None,
     ):
         """
         Initialize protected pipeline.
@@ -59,11 +90,20 @@ class ProtectedPipeline:
             guard: PromptGuard instance
             deanonymize_output: Whether to de-anonymize outputs
             store_mapping: Whether to store mappings for later use
+            max_workers: Anonymize batch inputs on a thread pool of this
+                size. Only worthwhile with detectors that release the GIL
+                (e.g., Presidio/spaCy) or on free-threaded Python; the
+                regex detector holds it, so batches run serially by default.
+                Release the pool with close() or by using the wrapper as a
+                context manager.
         """
         self.pipeline = pipeline
         self.guard = guard
         self.deanonymize_output = deanonymize_output
         self.store_mapping = store_mapping
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_finalizer: Optional[weakref.finalize] = None
         self._last_mapping: Optional[Dict[str, str]] = None
 
     def __call__(
@@ -83,12 +123,9 @@ class ProtectedPipeline:
 
         # Anonymize inputs
         if is_batch:
-            anonymized_inputs = []
-            mappings = []
-            for text in inputs:
-                anonymized, mapping = self.guard.anonymize(text)
-                anonymized_inputs.append(anonymized)
-                mappings.append(mapping)
+            results = self._batch_anonymize(inputs)
+            anonymized_inputs = [anonymized for anonymized, _ in results]
+            mappings = [mapping for _, mapping in results]
         else:
             anonymized_inputs, mapping = self.guard.anonymize(inputs)
             mappings = [mapping]
@@ -96,18 +133,20 @@ class ProtectedPipeline:
         # Store mapping for later retrieval
         if self.store_mapping:
             if is_batch:
-                # For batch, store combined mapping
-                self._last_mapping = {}
-                for m in mappings:
-                    self._last_mapping.update(m)
+                # For batch, store combined mapping (later inputs win)
+                self._last_mapping = {
+                    placeholder: original
+                    for m in mappings
+                    for placeholder, original in m.items()
+                }
             else:
                 self._last_mapping = mapping
 
         # Run pipeline
         outputs = self.pipeline(anonymized_inputs, **kwargs)
 
-        # De-anonymize outputs
-        if self.deanonymize_output:
+        # De-anonymize outputs; clean inputs leave nothing to restore
+        if self.deanonymize_output and any(mappings):
             if is_batch:
                 deanonymized_outputs = []
                 for output, mapping in zip(outputs, mappings):
@@ -119,38 +158,62 @@ class ProtectedPipeline:
 
         return outputs
 
+    def _batch_anonymize(self, inputs: List[str]) -> List[Tuple[str, Dict[str, str]]]:
+        """Anonymize batch inputs, on the thread pool when configured."""
+        if not self.max_workers or self.max_workers < 2 or len(inputs) < 2:
+            return self.guard.batch_anonymize(inputs)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            # Shut the pool down if the wrapper is collected without close()
+            self._executor_finalizer = weakref.finalize(
+                self, self._executor.shutdown, wait=False
+            )
+        return list(self._executor.map(self.guard.anonymize, inputs))
+
+    def close(self) -> None:
+        """Shut down the thread pool used for batch anonymization."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            self._executor_finalizer.detach()
+            executor.shutdown()
+
+    def __enter__(self) -> "ProtectedPipeline":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _deanonymize_output(self, output: Any, mapping: Dict[str, str]) -> Any:
-        """De-anonymize pipeline output."""
+        """
+        De-anonymize pipeline output.
+
+        Outputs are strings or nested lists/dicts of them (e.g., a list of
+        generated_text dicts per input). Containers are walked with an
+        explicit stack and their strings replaced in place, each exactly once.
+        """
         if not mapping:
             return output
 
-        # Handle different output formats
-        if isinstance(output, list):
-            # List of outputs (e.g., text generation)
-            return [self._deanonymize_output(item, mapping) for item in output]
-        elif isinstance(output, dict):
-            # Dict output (e.g., with scores)
-            if "generated_text" in output:
-                output["generated_text"] = self.guard.deanonymize(
-                    output["generated_text"], mapping
-                )
-            elif "summary_text" in output:
-                output["summary_text"] = self.guard.deanonymize(
-                    output["summary_text"], mapping
-                )
-            elif "translation_text" in output:
-                output["translation_text"] = self.guard.deanonymize(
-                    output["translation_text"], mapping
-                )
-            # Handle other text fields
-            for key in output:
-                if isinstance(output[key], str):
-                    output[key] = self.guard.deanonymize(output[key], mapping)
-            return output
-        elif isinstance(output, str):
-            # String output
+        if isinstance(output, str):
             return self.guard.deanonymize(output, mapping)
 
+        stack = [output]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                items = enumerate(node)
+            elif isinstance(node, dict):
+                items = node.items()
+            else:
+                continue
+
+            for key, value in items:
+                if isinstance(value, str):
+                    node[key] = self.guard.deanonymize(value, mapping)
+                elif isinstance(value, (list, dict)):
+                    stack.append(value)
+
         return output
 
     def get_last_mapping(self) -> Optional[Dict[str, str]]:
@@ -162,6 +225,23 @@ class ProtectedPipeline:
         return getattr(self.pipeline, name)
 
 
+@dataclass
+class _ConversationState:
+    """Anonymization state carried across turns of one conversation."""
+
+    # Anonymized text of each turn seen so far, so earlier turns are not
+    # re-scanned on every call
+    turns: List[str] = field(default_factory=list)
+    # Combined mapping for de-anonymizing responses
+    mapping: Dict[str, str] = field(default_factory=dict)
+    # Placeholder per (entity type, original) and last index per entity
+    # type, so numbering continues across turns instead of restarting
+    entities: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    # Drops this state once the conversation is garbage collected
+    finalizer: Optional[weakref.finalize] = None
+
+
 class ProtectedConversational:
     """
     Protected conversational pipeline for multi-turn conversations.
@@ -197,7 +277,7 @@ class ProtectedConversational:
         self.pipeline = pipeline
         self.guard = guard
         self.deanonymize_output = deanonymize_output
-        self._conversation_mappings: Dict[str, Dict[str, str]] = {}
+        self._conversations: Dict[int, _ConversationState] = {}
 
     def __call__(self, conversations: Any, **kwargs) -> Any:
         """
@@ -210,31 +290,40 @@ class ProtectedConversational:
         Returns:
             Protected conversation output(s)
         """
-        from transformers import Conversation
+        Conversation = _conversation_class()
 
         is_batch = isinstance(conversations, list)
         convs_to_process = conversations if is_batch else [conversations]
 
+        # Options and placeholder templates are resolved once per call
+        options = self.guard._resolve_options(None, None)
+        templates = self.guard._placeholder_templates()
+
         # Anonymize conversations
         anonymized_convs = []
+        states = []
         for conv in convs_to_process:
-            conv_id = id(conv)
-
-            # Initialize mapping for new conversations
-            if conv_id not in self._conversation_mappings:
-                self._conversation_mappings[conv_id] = {}
-
-            # Anonymize new messages
-            new_messages = []
-            for message in conv.iter_texts():
-                anonymized, mapping = self.guard.anonymize(message)
-                new_messages.append(anonymized)
+            state = self._get_state(conv)
+            states.append(state)
+
+            # iter_texts() yields (is_user, text) pairs
+            texts = [text for _, text in conv.iter_texts()]
+            if len(texts) < len(state.turns):
+                # History was rewritten rather than extended
+                state.turns.clear()
+
+            # Anonymize only the turns added since the last call
+            for text in texts[len(state.turns):]:
+                anonymized, mapping = self.guard._anonymize(
+                    text, options, templates, state.entities, state.counters
+                )
+                state.turns.append(anonymized)
                 # Accumulate mappings across conversation
-                self._conversation_mappings[conv_id].update(mapping)
+                state.mapping.update(mapping)
 
             # Create anonymized conversation
             anonymized_conv = Conversation()
-            for msg in new_messages:
+            for msg in state.turns:
                 anonymized_conv.add_user_input(msg)
 
             anonymized_convs.append(anonymized_conv)
@@ -245,12 +334,13 @@ class ProtectedConversational:
         else:
             outputs = self.pipeline(anonymized_convs[0], **kwargs)
 
-        # De-anonymize outputs
-        if self.deanonymize_output:
+        # De-anonymize outputs, skipping conversations without any PII
+        if self.deanonymize_output and any(state.mapping for state in states):
             output_convs = outputs if is_batch else [outputs]
-            for i, (conv, orig_conv) in enumerate(zip(output_convs, convs_to_process)):
-                conv_id = id(orig_conv)
-                mapping = self._conversation_mappings.get(conv_id, {})
+            for conv, state in zip(output_convs, states):
+                mapping = state.mapping
+                if not mapping:
+                    continue
 
                 # De-anonymize generated responses
                 if hasattr(conv, "generated_responses"):
@@ -261,11 +351,31 @@ class ProtectedConversational:
 
         return outputs
 
+    def _get_state(self, conversation: Any) -> _ConversationState:
+        """
+        Get the state for a conversation, creating it on first use.
+
+        Conversations define ``__eq__`` and are therefore unhashable, so
+        state is keyed by ``id()``. A finalizer removes the entry when the
+        conversation is collected, which keeps long-running processes from
+        accumulating state and stops a recycled ``id()`` from picking up
+        another conversation's mappings.
+        """
+        conv_id = id(conversation)
+        state = self._conversations.get(conv_id)
+        if state is None:
+            state = _ConversationState()
+            state.finalizer = weakref.finalize(
+                conversation, self._conversations.pop, conv_id, None
+            )
+            self._conversations[conv_id] = state
+        return state
+
     def reset_conversation(self, conversation: Any) -> None:
         """Reset conversation mapping."""
-        conv_id = id(conversation)
-        if conv_id in self._conversation_mappings:
-            del self._conversation_mappings[conv_id]
+        state = self._conversations.pop(id(conversation), None)
+        if state is not None and state.finalizer is not None:
+            state.finalizer.detach()
 
 
 class ProtectedTextGeneration:
@@ -292,6 +402,7 @@ class ProtectedTextGeneration:
         tokenizer: Any,
         guard: Any,
         deanonymize_output: bool = True,
+        tokenize_cache_size: int = 128,
     ):
         """
         Initialize protected text generation.
@@ -301,11 +412,20 @@ class ProtectedTextGeneration:
             tokenizer: Hugging Face tokenizer
             guard: PromptGuard instance
             deanonymize_output: Whether to de-anonymize outputs
+            tokenize_cache_size: Number of recent prompt batches whose
+                tokenized inputs are kept for reuse (0 disables caching)
         """
         self.model = model
         self.tokenizer = tokenizer
         self.guard = guard
         self.deanonymize_output = deanonymize_output
+        # Repeated prompts (retries, sampling sweeps) anonymize to the same
+        # text, so their tokenization can be reused
+        self._tokenize = (
+            lru_cache(maxsize=tokenize_cache_size)(self._tokenize_uncached)
+            if tokenize_cache_size > 0
+            else self._tokenize_uncached
+        )
 
     def generate(
         self, prompt: Union[str, List[str]], **kwargs
@@ -324,22 +444,16 @@ class ProtectedTextGeneration:
         prompts = prompt if is_batch else [prompt]
 
         # Anonymize prompts
-        anonymized_prompts = []
-        mappings = []
-        for p in prompts:
-            anonymized, mapping = self.guard.anonymize(p)
-            anonymized_prompts.append(anonymized)
-            mappings.append(mapping)
+        results = self.guard.batch_anonymize(prompts)
+        anonymized_prompts = [anonymized for anonymized, _ in results]
+        mappings = [mapping for _, mapping in results]
 
         # Tokenize
-        inputs = self.tokenizer(
-            anonymized_prompts,
-            return_tensors="pt",
-            padding=True,
-            truncation=True,
-        )
+        inputs = self._to_model_device(self._tokenize(tuple(anonymized_prompts)))
 
-        # Generate
+        # Generate; padded batches tell the model which token is padding
+        if len(prompts) > 1 and self._pad_token_id is not None:
+            kwargs.setdefault("pad_token_id", self._pad_token_id)
         outputs = self.model.generate(**inputs, **kwargs)
 
         # Decode
@@ -347,21 +461,156 @@ class ProtectedTextGeneration:
             outputs, skip_special_tokens=True
         )
 
-        # De-anonymize
-        if self.deanonymize_output:
-            deanonymized = []
-            for text, mapping in zip(generated_texts, mappings):
-                deanonymized.append(self.guard.deanonymize(text, mapping))
-            generated_texts = deanonymized
+        # De-anonymize, unless no prompt contained PII
+        if self.deanonymize_output and any(mappings):
+            generated_texts = self.guard.batch_deanonymize(generated_texts, mappings)
 
         return generated_texts if is_batch else generated_texts[0]
 
+    def generate_stream(
+        self, prompt: str, stream_timeout: Optional[float] = 60.0, **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text with PII protection, yielding it as it is decoded.
+
+        Generation runs on a background thread feeding a
+        ``TextIteratorStreamer``, so the first text is available after the
+        first tokens rather than after the whole sequence. Errors raised by
+        generation are re-raised here, and closing the iterator early stops
+        generation after the current step.
+
+        Args:
+            prompt: Input prompt
+            stream_timeout: Seconds to wait for the next chunk before raising
+                ``queue.Empty`` (None waits indefinitely)
+            **kwargs: Generation arguments (max_length, temperature, etc.)
+
+        Yields:
+            Chunks of generated text
+        """
+        from transformers import StoppingCriteriaList, TextIteratorStreamer
+
+        anonymized_prompt, mapping = self.guard.anonymize(prompt)
+
+        inputs = self._to_model_device(self._tokenize((anonymized_prompt,)))
+
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_special_tokens=True, timeout=stream_timeout
+        )
+        stop = Event()
+        stopping_criteria = StoppingCriteriaList(
+            [
+                *(kwargs.pop("stopping_criteria", None) or ()),
+                _event_stopping_criteria_class()(stop),
+            ]
+        )
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                self.model.generate(
+                    **inputs,
+                    **kwargs,
+                    streamer=streamer,
+                    stopping_criteria=stopping_criteria,
+                )
+            except BaseException as exc:
+                errors.append(exc)
+                # Otherwise the consumer waits for an end signal never sent
+                streamer.end()
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+
+        try:
+            if not (self.deanonymize_output and mapping):
+                yield from streamer
+            else:
+                # Hold back a trailing partial placeholder until it completes
+                pending = ""
+                for chunk in streamer:
+                    pending += chunk
+                    end = _stream_safe_end(pending, mapping)
+                    if end:
+                        yield self.guard.deanonymize(pending[:end], mapping)
+                        pending = pending[end:]
+                if pending:
+                    yield self.guard.deanonymize(pending, mapping)
+        finally:
+            # Stops generation if the consumer stopped iterating early
+            stop.set()
+            thread.join(stream_timeout)
+
+        if errors:
+            raise errors[0]
+
+    @property
+    def _pad_token_id(self) -> Optional[int]:
+        """Token used to pad batches, falling back to EOS (e.g. GPT-2)."""
+        pad_token_id = getattr(self.tokenizer, "pad_token_id", None)
+        if pad_token_id is None:
+            pad_token_id = getattr(self.tokenizer, "eos_token_id", None)
+        return pad_token_id
+
+    def _tokenize_uncached(self, prompts: Tuple[str, ...]) -> Any:
+        """Tokenize a batch of anonymized prompts into padded tensors."""
+        if len(prompts) == 1 or getattr(self.tokenizer, "pad_token", None) is not None:
+            return self.tokenizer(
+                list(prompts),
+                return_tensors="pt",
+                padding=len(prompts) > 1,
+                truncation=True,
+            )
+
+        # Causal LM tokenizers often ship without a pad token. Pad with EOS
+        # here rather than setting one on the caller's tokenizer.
+        import torch
+
+        sequences = self.tokenizer(list(prompts), truncation=True)["input_ids"]
+        width = max(len(sequence) for sequence in sequences)
+        pad_left = getattr(self.tokenizer, "padding_side", "right") == "left"
+        input_ids = []
+        attention_mask = []
+        for sequence in sequences:
+            padding = width - len(sequence)
+            ids = [self._pad_token_id] * padding
+            mask = [0] * padding
+            if pad_left:
+                input_ids.append(ids + sequence)
+                attention_mask.append(mask + [1] * len(sequence))
+            else:
+                input_ids.append(sequence + ids)
+                attention_mask.append([1] * len(sequence) + mask)
+        return {
+            "input_ids": torch.tensor(input_ids),
+            "attention_mask": torch.tensor(attention_mask),
+        }
+
+    def _to_model_device(self, inputs: Any) -> Dict[str, Any]:
+        """
+        Move tokenized inputs to the model's device.
+
+        On CUDA the tensors are pinned first so the host-to-device copies
+        run asynchronously instead of blocking on each tensor.
+        """
+        device = getattr(self.model, "device", None)
+        if device is None:
+            return inputs
+
+        if getattr(device, "type", None) == "cuda":
+            return {
+                key: value.pin_memory().to(device, non_blocking=True)
+                for key, value in inputs.items()
+            }
+        return {key: value.to(device) for key, value in inputs.items()}
+
 
 def create_protected_pipeline(
     pipeline: Any,
     guard: Any,
     deanonymize_output: bool = True,
     store_mapping: bool = False,
+    max_workers: Optional[int] = None,
 ) -> ProtectedPipeline:
     """
     Create a protected Hugging Face pipeline.
@@ -371,6 +620,7 @@ def create_protected_pipeline(
         guard: PromptGuard instance
         deanonymize_output: Whether to de-anonymize outputs
         store_mapping: Whether to store mappings
+        max_workers: Thread pool size for anonymizing batch inputs
 
     Returns:
         ProtectedPipeline instance
@@ -383,7 +633,9 @@ def create_protected_pipeline(
         >>> guard = PromptGuard(policy="default_pii")
         >>> protected = create_protected_pipeline(pipe, guard)
     """
-    return ProtectedPipeline(pipeline, guard, deanonymize_output, store_mapping)
+    return ProtectedPipeline(
+        pipeline, guard, deanonymize_output, store_mapping, max_workers
+    )
 
 
 def create_protected_conversational(
@@ -418,6 +670,7 @@ def create_protected_text_generation(
     tokenizer: Any,
     guard: Any,
     deanonymize_output: bool = True,
+    tokenize_cache_size: int = 128,
 ) -> ProtectedTextGeneration:
     """
     Create a protected text generation instance.
@@ -427,6 +680,7 @@ def create_protected_text_generation(
         tokenizer: Hugging Face tokenizer
         guard: PromptGuard instance
         deanonymize_output: Whether to de-anonymize outputs
+        tokenize_cache_size: Number of tokenized prompt batches to cache
 
     Returns:
         ProtectedTextGeneration instance
@@ -441,7 +695,9 @@ def create_protected_text_generation(
         >>>
         >>> protected = create_protected_text_generation(model, tokenizer, guard)
     """
-    return ProtectedTextGeneration(model, tokenizer, guard, deanonymize_output)
+    return ProtectedTextGeneration(
+        model, tokenizer, guard, deanonymize_output, tokenize_cache_size
+    )
 
 
 __all__ = [
@@ -6,20 +6,62 @@ automatically anonymizing prompts and de-anonymizing responses.
 """
 
 from typing import Any, List, Optional, Dict, Mapping as TypeMapping
+from functools import lru_cache
+import asyncio
+import hashlib
 import logging
 
+from ..guard import _AnonymizeCache
+from ..types import AnonymizeResult
+
 logger = logging.getLogger(__name__)
 
 try:
     from langchain.llms.base import LLM
-    from langchain.callbacks.manager import CallbackManagerForLLMRun
+    from langchain.schema.runnable import Runnable, RunnableConfig
+    from langchain.callbacks.manager import (
+        AsyncCallbackManagerForLLMRun,
+        CallbackManagerForLLMRun,
+    )
     LANGCHAIN_AVAILABLE = True
 except ImportError:
     LANGCHAIN_AVAILABLE = False
     logger.warning("LangChain not available. Install with: pip install langchain")
 
+if LANGCHAIN_AVAILABLE:
+    # Older LangChain releases build LLM on pydantic.v1 even when pydantic 2
+    # is installed; private attributes must come from the same major version
+    if hasattr(LLM, "model_fields"):
+        from pydantic import PrivateAttr
+    else:
+        try:
+            from pydantic.v1 import PrivateAttr
+        except ImportError:
+            from pydantic import PrivateAttr
+
+
+def _prompt_key(prompt: str) -> bytes:
+    """Key stored mappings by a 16-byte digest instead of the full prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
 
 if LANGCHAIN_AVAILABLE:
+    @lru_cache(maxsize=None)
+    def _message_constructor(message_type: type) -> Optional[type]:
+        """
+        Resolve the message class an anonymized copy is rebuilt as.
+
+        Resolved once per concrete type, so subclasses (e.g. message chunks)
+        still map to their base message class as with isinstance checks.
+        """
+        from langchain.schema import HumanMessage, AIMessage, SystemMessage
+
+        for message_class in (HumanMessage, AIMessage, SystemMessage):
+            if issubclass(message_type, message_class):
+                return message_class
+        return None
+
+
     class ProtectedLLM(LLM):
         """
         LangChain LLM wrapper that anonymizes PII before sending to the underlying LLM.
@@ -41,7 +83,10 @@ if LANGCHAIN_AVAILABLE:
         guard: Any  #: PromptGuard instance
         deanonymize_response: bool = True  #: Whether to de-anonymize responses
         store_mappings: bool = False  #: Whether to store mappings for later retrieval
-        _mappings: Dict[str, Dict[str, str]] = {}  #: Internal mapping storage
+        #: Internal mapping storage, per instance and keyed by prompt digest
+        _mappings: Dict[bytes, Dict[str, str]] = PrivateAttr(default_factory=dict)
+        #: Anonymization cache owned by this instance, built on first use
+        _anonymize_cache: Optional[_AnonymizeCache] = PrivateAttr(default=None)
 
         @property
         def _llm_type(self) -> str:
@@ -68,19 +113,76 @@ if LANGCHAIN_AVAILABLE:
                 The LLM response (de-anonymized if enabled)
             """
             # Anonymize the prompt
-            anonymized_prompt, mapping = self.guard.anonymize(prompt)
+            anonymized_prompt, mapping = self._anonymize(prompt)
 
             # Store mapping if requested
             if self.store_mappings:
-                self._mappings[prompt] = mapping
+                self._mappings[_prompt_key(prompt)] = mapping
+
+            # Call the underlying LLM, through invoke() where available to
+            # skip the deprecated __call__ shim
+            callbacks = run_manager.get_child() if run_manager else None
+            if hasattr(self.llm, "invoke"):
+                response = self.llm.invoke(
+                    anonymized_prompt,
+                    config={"callbacks": callbacks},
+                    stop=stop,
+                    **kwargs,
+                )
+            else:
+                response = self.llm(
+                    anonymized_prompt,
+                    stop=stop,
+                    callbacks=callbacks,
+                    **kwargs,
+                )
+
+            # De-anonymize the response if enabled
+            if self.deanonymize_response and mapping:
+                response = self.guard.deanonymize(response, mapping)
+
+            return response
+
+        async def _acall(
+            self,
+            prompt: str,
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+            **kwargs: Any,
+        ) -> str:
+            """
+            Asynchronously call the LLM with PII protection.
+
+            LangChain's ``abatch``/``agenerate`` run this concurrently for
+            each prompt, so batches fan out over the underlying LLM's async
+            API instead of calling ``_call`` on a thread per prompt.
 
-            # Call the underlying LLM
-            response = self.llm(
-                anonymized_prompt,
+            Args:
+                prompt: The prompt to send to the LLM
+                stop: Stop sequences
+                run_manager: Async callback manager
+                **kwargs: Additional arguments for the underlying LLM
+
+            Returns:
+                The LLM response (de-anonymized if enabled)
+            """
+            # Anonymize the prompt off the event loop
+            anonymized_prompt, mapping = await asyncio.get_running_loop().run_in_executor(
+                None, self._anonymize, prompt
+            )
+
+            # Store mapping if requested
+            if self.store_mappings:
+                self._mappings[_prompt_key(prompt)] = mapping
+
+            # Call the underlying LLM asynchronously
+            result = await self.llm.agenerate(
+                [anonymized_prompt],
                 stop=stop,
                 callbacks=run_manager.get_child() if run_manager else None,
                 **kwargs,
             )
+            response = result.generations[0][0].text
 
             # De-anonymize the response if enabled
             if self.deanonymize_response and mapping:
@@ -98,12 +200,131 @@ if LANGCHAIN_AVAILABLE:
             Returns:
                 The PII mapping, or None if not found/stored
             """
-            return self._mappings.get(prompt)
+            return self._mappings.get(_prompt_key(prompt))
+
+        def clear_mappings(self) -> None:
+            """Clear all stored mappings."""
+            self._mappings.clear()
+
+        def _anonymize(self, prompt: str) -> AnonymizeResult:
+            """Anonymize a prompt through this instance's cache."""
+            if self._anonymize_cache is None:
+                self._anonymize_cache = _AnonymizeCache(self.guard)
+            return self._anonymize_cache(prompt)
+
+        def clear_cache(self) -> None:
+            """Clear this instance's anonymization cache."""
+            if self._anonymize_cache is not None:
+                self._anonymize_cache.clear()
+
+
+    class ProtectedRunnable(Runnable):
+        """
+        Lightweight LangChain runnable wrapper with PII protection.
+
+        Unlike ProtectedLLM this is not a pydantic model, so constructing it
+        and setting its attributes involve no validation. It wraps any
+        runnable taking a string prompt, LLMs and chat models alike.
+
+        Example:
+            >>> from langchain.llms import OpenAI
+            >>> from prompt_guard import PromptGuard
+            >>> from prompt_guard.adapters.langchain_adapter import ProtectedRunnable
+            >>>
+            >>> guard = PromptGuard(policy="default_pii")
+            >>> protected = ProtectedRunnable(OpenAI(), guard)
+            >>> response = protected.invoke("My email is john@example.com")
+        """
+
+        def __init__(
+            self,
+            llm: Any,
+            guard: Any,
+            deanonymize_response: bool = True,
+            store_mappings: bool = False,
+        ):
+            """
+            Initialize protected runnable.
+
+            Args:
+                llm: The underlying runnable (LLM or chat model)
+                guard: PromptGuard instance
+                deanonymize_response: Whether to de-anonymize responses
+                store_mappings: Whether to store mappings for later retrieval
+            """
+            self.llm = llm
+            self.guard = guard
+            self.deanonymize_response = deanonymize_response
+            self.store_mappings = store_mappings
+            self._mappings: Dict[bytes, Dict[str, str]] = {}
+            self._anonymize = _AnonymizeCache(guard)
+
+        def invoke(
+            self,
+            input: str,
+            config: Optional[RunnableConfig] = None,
+            **kwargs: Any,
+        ) -> Any:
+            """
+            Invoke the underlying runnable with PII protection.
+
+            Args:
+                input: The prompt to send
+                config: Runnable config passed through unchanged
+                **kwargs: Additional arguments for the underlying runnable
+
+            Returns:
+                The response (de-anonymized if enabled)
+            """
+            anonymized_prompt, mapping = self._anonymize(input)
+            if self.store_mappings:
+                self._mappings[_prompt_key(input)] = mapping
+
+            response = self.llm.invoke(anonymized_prompt, config, **kwargs)
+            return self._restore(response, mapping)
+
+        async def ainvoke(
+            self,
+            input: str,
+            config: Optional[RunnableConfig] = None,
+            **kwargs: Any,
+        ) -> Any:
+            """Asynchronously invoke the underlying runnable with PII protection."""
+            anonymized_prompt, mapping = await asyncio.get_running_loop().run_in_executor(
+                None, self._anonymize, input
+            )
+            if self.store_mappings:
+                self._mappings[_prompt_key(input)] = mapping
+
+            response = await self.llm.ainvoke(anonymized_prompt, config, **kwargs)
+            return self._restore(response, mapping)
+
+        def __call__(self, prompt: str, **kwargs: Any) -> Any:
+            """Call like a LangChain LLM; same as invoke()."""
+            return self.invoke(prompt, **kwargs)
+
+        def _restore(self, response: Any, mapping: Dict[str, str]) -> Any:
+            """De-anonymize a string response or a message's content."""
+            if not (self.deanonymize_response and mapping):
+                return response
+            if isinstance(response, str):
+                return self.guard.deanonymize(response, mapping)
+            if hasattr(response, "content"):
+                response.content = self.guard.deanonymize(response.content, mapping)
+            return response
+
+        def get_mapping(self, prompt: str) -> Optional[Dict[str, str]]:
+            """Get the PII mapping for a specific prompt, if stored."""
+            return self._mappings.get(_prompt_key(prompt))
 
         def clear_mappings(self) -> None:
             """Clear all stored mappings."""
             self._mappings.clear()
 
+        def clear_cache(self) -> None:
+            """Clear this runnable's anonymization cache."""
+            self._anonymize.clear()
+
 
     class ProtectedChatLLM:
         """
@@ -152,44 +373,39 @@ if LANGCHAIN_AVAILABLE:
             Returns:
                 Chat model response
             """
-            from langchain.schema import HumanMessage, AIMessage, SystemMessage
+            # Anonymize all message contents in one batch so options and
+            # placeholder templates are resolved once per call. Placeholders
+            # are shared across messages: a repeated value keeps one
+            # placeholder and the combined mapping has no collisions
+            results = self.guard.batch_anonymize(
+                [message.content for message in messages],
+                share_placeholders=True,
+            )
 
-            # Anonymize messages
+            # Preserve message type; unknown types pass through unchanged
             anonymized_messages = []
-            mappings = []
-
-            for message in messages:
-                content = message.content
-                anonymized_content, mapping = self.guard.anonymize(content)
-                mappings.append(mapping)
-
-                # Preserve message type
-                if isinstance(message, HumanMessage):
-                    anonymized_messages.append(
-                        HumanMessage(content=anonymized_content)
-                    )
-                elif isinstance(message, AIMessage):
-                    anonymized_messages.append(
-                        AIMessage(content=anonymized_content)
-                    )
-                elif isinstance(message, SystemMessage):
-                    anonymized_messages.append(
-                        SystemMessage(content=anonymized_content)
-                    )
-                else:
-                    anonymized_messages.append(message)
-
-            # Call underlying chat model
-            response = self.chat(anonymized_messages, **kwargs)
-
-            # De-anonymize response if enabled
-            if self.deanonymize_response and mappings:
-                # Combine all mappings
-                combined_mapping = {}
-                for mapping in mappings:
-                    combined_mapping.update(mapping)
-
-                if hasattr(response, 'content'):
+            for message, (anonymized_content, _) in zip(messages, results):
+                constructor = _message_constructor(type(message))
+                anonymized_messages.append(
+                    constructor(content=anonymized_content) if constructor else message
+                )
+
+            # Call underlying chat model, through invoke() where available
+            if hasattr(self.chat, "invoke"):
+                response = self.chat.invoke(anonymized_messages, **kwargs)
+            else:
+                response = self.chat(anonymized_messages, **kwargs)
+
+            # De-anonymize response if enabled and any message held PII
+            if self.deanonymize_response:
+                # Combine all mappings straight from the batch results
+                combined_mapping = {
+                    placeholder: original
+                    for _, mapping in results
+                    for placeholder, original in mapping.items()
+                }
+
+                if combined_mapping and hasattr(response, 'content'):
                     response.content = self.guard.deanonymize(
                         response.content, combined_mapping
                     )
@@ -225,7 +441,7 @@ def create_protected_chat(
     chat: Any,
     guard: Any,
     **kwargs: Any,
-) -> ProtectedChatLLM:
+) -> "ProtectedChatLLM":
     """
     Create a protected LangChain chat model.
 
@@ -5,9 +5,12 @@ Provides seamless integration with LlamaIndex query engines and chat engines,
 automatically anonymizing queries and de-anonymizing responses.
 """
 
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
+import asyncio
 import logging
 
+from ..guard import _AnonymizeCache, _stream_safe_end
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -30,6 +33,35 @@ except ImportError:
 
 if LLAMAINDEX_AVAILABLE:
 
+    def _node_text_fields(nodes: Optional[List[Any]]) -> List[Tuple[Any, str]]:
+        """List the text field of each source node that has one."""
+        return [(node, "text") for node in nodes or [] if hasattr(node, "text")]
+
+    def _response_text_fields(response: Any) -> List[Tuple[Any, str]]:
+        """List the text fields of a Response."""
+        fields = _node_text_fields(response.source_nodes)
+        if response.response is not None:
+            fields.append((response, "response"))
+        return fields
+
+    def _streaming_text_fields(response: Any) -> List[Tuple[Any, str]]:
+        """List the text fields of a StreamingResponse (its text is still streaming)."""
+        return _node_text_fields(response.source_nodes)
+
+    def _any_text_fields(response: Any) -> List[Tuple[Any, str]]:
+        """List the text fields of a response of any other type."""
+        fields = _node_text_fields(getattr(response, "source_nodes", None))
+        if getattr(response, "response", None) is not None:
+            fields.append((response, "response"))
+        return fields
+
+    # Query responses are almost always one of these two types, whose fields
+    # are known; anything else (including subclasses) is probed generically
+    _TEXT_FIELDS = {
+        Response: _response_text_fields,
+        StreamingResponse: _streaming_text_fields,
+    }
+
     class ProtectedQueryEngine:
         """
         LlamaIndex QueryEngine wrapper that anonymizes PII before querying.
@@ -72,6 +104,7 @@ if LLAMAINDEX_AVAILABLE:
             self.deanonymize_response = deanonymize_response
             self.store_mappings = store_mappings
             self._mappings: Dict[str, Dict[str, str]] = {}
+            self._anonymize = _AnonymizeCache(guard)
 
         def query(self, query: str) -> Any:
             """
@@ -84,7 +117,7 @@ if LLAMAINDEX_AVAILABLE:
                 Query response (de-anonymized if enabled)
             """
             # Anonymize the query
-            anonymized_query, mapping = self.guard.anonymize(query)
+            anonymized_query, mapping = self._anonymize(query)
 
             # Store mapping if requested
             if self.store_mappings:
@@ -95,16 +128,7 @@ if LLAMAINDEX_AVAILABLE:
 
             # De-anonymize the response if enabled
             if self.deanonymize_response and mapping:
-                if hasattr(response, "response"):
-                    response.response = self.guard.deanonymize(
-                        response.response, mapping
-                    )
-
-                # Also de-anonymize source nodes if present
-                if hasattr(response, "source_nodes"):
-                    for node in response.source_nodes:
-                        if hasattr(node, "text"):
-                            node.text = self.guard.deanonymize(node.text, mapping)
+                self._restore(response, mapping)
 
             return response
 
@@ -118,8 +142,11 @@ if LLAMAINDEX_AVAILABLE:
             Returns:
                 Query response (de-anonymized if enabled)
             """
-            # Anonymize the query
-            anonymized_query, mapping = self.guard.anonymize(query)
+            # Anonymize the query off the event loop; the regex scan is CPU-bound
+            loop = asyncio.get_running_loop()
+            anonymized_query, mapping = await loop.run_in_executor(
+                None, self._anonymize, query
+            )
 
             # Store mapping if requested
             if self.store_mappings:
@@ -132,15 +159,56 @@ if LLAMAINDEX_AVAILABLE:
                 # Fallback to sync if async not supported
                 response = self.query_engine.query(anonymized_query)
 
-            # De-anonymize the response
+            # De-anonymize the response; source nodes can be many and long,
+            # so this runs on the executor rather than on the loop
             if self.deanonymize_response and mapping:
-                if hasattr(response, "response"):
-                    response.response = self.guard.deanonymize(
-                        response.response, mapping
-                    )
+                await loop.run_in_executor(None, self._restore, response, mapping)
 
             return response
 
+        def _restore(self, response: Any, mapping: Dict[str, str]) -> None:
+            """
+            De-anonymize a response's text and its source nodes in place.
+
+            All fields go through one batch so the placeholder pattern is
+            resolved once for all of them.
+            """
+            fields = _TEXT_FIELDS.get(type(response), _any_text_fields)(response)
+            if not fields:
+                return
+
+            texts = self.guard.batch_deanonymize(
+                [getattr(obj, name) for obj, name in fields],
+                [mapping] * len(fields),
+            )
+            for (obj, name), text in zip(fields, texts):
+                setattr(obj, name, text)
+
+        async def abatch(
+            self, queries: List[str], max_concurrency: Optional[int] = None
+        ) -> List[Any]:
+            """
+            Run several queries concurrently with PII protection.
+
+            Args:
+                queries: The query strings
+                max_concurrency: Maximum number of queries in flight at once
+                    (None = all of them)
+
+            Returns:
+                Query responses in the order of ``queries``
+            """
+            if not max_concurrency:
+                return await asyncio.gather(*(self.aquery(q) for q in queries))
+
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def _query_one(query: str) -> Any:
+                async with semaphore:
+                    return await self.aquery(query)
+
+            return await asyncio.gather(*(_query_one(q) for q in queries))
+
         def get_mapping(self, query: str) -> Optional[Dict[str, str]]:
             """Get the PII mapping for a specific query."""
             return self._mappings.get(query)
@@ -149,6 +217,10 @@ if LLAMAINDEX_AVAILABLE:
             """Clear all stored mappings."""
             self._mappings.clear()
 
+        def clear_cache(self) -> None:
+            """Clear this engine's anonymization cache."""
+            self._anonymize.clear()
+
     class ProtectedChatEngine:
         """
         LlamaIndex ChatEngine wrapper with PII protection.
@@ -186,6 +258,7 @@ if LLAMAINDEX_AVAILABLE:
             self.guard = guard
             self.deanonymize_response = deanonymize_response
             self._conversation_mapping: Dict[str, str] = {}
+            self._anonymize = _AnonymizeCache(guard)
 
         def chat(self, message: str) -> Any:
             """
@@ -198,10 +271,10 @@ if LLAMAINDEX_AVAILABLE:
                 Chat response
             """
             # Anonymize the message
-            anonymized_message, mapping = self.guard.anonymize(message)
+            anonymized_message, mapping = self._anonymize(message)
 
             # Update conversation mapping (accumulate across turns)
-            self._conversation_mapping.update(mapping)
+            self._remember_mapping(mapping)
 
             # Chat with the underlying engine
             response = self.chat_engine.chat(anonymized_message)
@@ -225,11 +298,13 @@ if LLAMAINDEX_AVAILABLE:
             Returns:
                 Chat response
             """
-            # Anonymize the message
-            anonymized_message, mapping = self.guard.anonymize(message)
+            # Anonymize the message off the event loop
+            anonymized_message, mapping = await asyncio.get_running_loop().run_in_executor(
+                None, self._anonymize, message
+            )
 
-            # Update conversation mapping
-            self._conversation_mapping.update(mapping)
+            # Update conversation mapping (accumulate across turns)
+            self._remember_mapping(mapping)
 
             # Chat with the underlying engine asynchronously
             if hasattr(self.chat_engine, "achat"):
@@ -251,7 +326,23 @@ if LLAMAINDEX_AVAILABLE:
             """Reset conversation history and mappings."""
             if hasattr(self.chat_engine, "reset"):
                 self.chat_engine.reset()
-            self._conversation_mapping.clear()
+            self._conversation_mapping = {}
+
+        def _remember_mapping(self, mapping: Dict[str, str]) -> None:
+            """
+            Add a turn's mapping to the conversation mapping.
+
+            The conversation mapping is replaced rather than updated in place,
+            so each version is an immutable snapshot: a stream keeps the one
+            it started with without copying it. Turns without PII keep the
+            current version.
+            """
+            if mapping:
+                self._conversation_mapping = {**self._conversation_mapping, **mapping}
+
+        def clear_cache(self) -> None:
+            """Clear this engine's anonymization cache."""
+            self._anonymize.clear()
 
         def stream_chat(self, message: str) -> Any:
             """
@@ -264,10 +355,10 @@ if LLAMAINDEX_AVAILABLE:
                 Streaming response
             """
             # Anonymize the message
-            anonymized_message, mapping = self.guard.anonymize(message)
+            anonymized_message, mapping = self._anonymize(message)
 
-            # Update conversation mapping
-            self._conversation_mapping.update(mapping)
+            # Update conversation mapping (accumulate across turns)
+            self._remember_mapping(mapping)
 
             # Stream chat with the underlying engine
             if hasattr(self.chat_engine, "stream_chat"):
@@ -275,27 +366,48 @@ if LLAMAINDEX_AVAILABLE:
 
                 # Wrap the streaming response to de-anonymize chunks
                 if self.deanonymize_response and self._conversation_mapping:
-                    return self._deanonymize_stream(response)
+                    return self._deanonymize_stream(
+                        response, self._conversation_mapping
+                    )
 
                 return response
             else:
                 raise NotImplementedError("Chat engine does not support streaming")
 
-        def _deanonymize_stream(self, stream):
-            """Wrap a streaming response to de-anonymize chunks."""
+        def _deanonymize_stream(self, stream, mapping: Dict[str, str]):
+            """
+            Wrap a streaming response to de-anonymize chunks.
+
+            Streamed chunks are often a few characters, so a placeholder can
+            be split across them. Each chunk is held until the next arrives
+            and carries the text that is safe to emit by then; a trailing
+            partial placeholder waits, and the last chunk carries the rest.
+            """
+            pending = ""
+            held = None
             for chunk in stream:
-                if hasattr(chunk, "response"):
-                    chunk.response = self.guard.deanonymize(
-                        chunk.response, self._conversation_mapping
-                    )
-                yield chunk
+                if not hasattr(chunk, "response"):
+                    yield chunk
+                    continue
+
+                pending += chunk.response
+                if held is not None:
+                    end = _stream_safe_end(pending, mapping)
+                    held.response = self.guard.deanonymize(pending[:end], mapping)
+                    pending = pending[end:]
+                    yield held
+                held = chunk
+
+            if held is not None:
+                held.response = self.guard.deanonymize(pending, mapping)
+                yield held
 
 
 def create_protected_query_engine(
     query_engine: Any,
     guard: Any,
     **kwargs: Any,
-) -> ProtectedQueryEngine:
+) -> "ProtectedQueryEngine":
     """
     Create a protected LlamaIndex query engine.
 
@@ -319,7 +431,7 @@ def create_protected_chat_engine(
     chat_engine: Any,
     guard: Any,
     **kwargs: Any,
-) -> ProtectedChatEngine:
+) -> "ProtectedChatEngine":
     """
     Create a protected LlamaIndex chat engine.
 
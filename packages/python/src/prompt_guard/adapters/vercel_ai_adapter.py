@@ -22,13 +22,43 @@ Example:
 """
 
 from typing import Any, AsyncIterator, Dict, Optional, List, Callable
-import json
 import asyncio
 import logging
+import re
+
+from ..guard import _stream_safe_end
 
 logger = logging.getLogger(__name__)
 
 
+def _string_leaves(obj: Any, leaves: List[str]) -> List[str]:
+    """Collect the strings (keys included) of a JSON-like value, in walk order."""
+    if isinstance(obj, str):
+        leaves.append(obj)
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            _string_leaves(key, leaves)
+            _string_leaves(value, leaves)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _string_leaves(item, leaves)
+    return leaves
+
+
+def _replace_leaves(obj: Any, replacements: Any) -> Any:
+    """Rebuild a JSON-like value taking its strings, in walk order, from an iterator."""
+    if isinstance(obj, str):
+        return next(replacements)
+    if isinstance(obj, dict):
+        return {
+            _replace_leaves(key, replacements): _replace_leaves(value, replacements)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_replace_leaves(item, replacements) for item in obj]
+    return obj
+
+
 class VercelAIAdapter:
     """
     Adapter for Vercel AI SDK integration.
@@ -49,37 +79,51 @@ class VercelAIAdapter:
         self.deanonymize_response = deanonymize_response
         self._is_async = hasattr(guard, "anonymize_async")
 
+    async def _anonymize_all(self, texts: List[str]) -> List[Any]:
+        """Anonymize texts with placeholders numbered across all of them."""
+        if self._is_async:
+            return await self.guard.batch_anonymize(texts, share_placeholders=True)
+        return self.guard.batch_anonymize(texts, share_placeholders=True)
+
     async def protect_messages(
-        self, messages: List[Dict[str, Any]]
+        self, messages: List[Dict[str, Any]], copy_messages: bool = True
     ) -> tuple[List[Dict[str, Any]], Dict[str, str]]:
         """
         Protect messages array (Vercel AI SDK format).
 
         Args:
             messages: Array of message objects with 'role' and 'content'
+            copy_messages: Return anonymized copies of the messages; if False,
+                their content is replaced in place (for callers that do not
+                need the originals)
 
         Returns:
             Tuple of (anonymized_messages, mapping)
         """
-        anonymized_messages = []
-        combined_mapping = {}
-
-        for message in messages:
-            if "content" in message and isinstance(message["content"], str):
-                if self._is_async:
-                    result = await self.guard.anonymize_async(message["content"])
-                    anonymized_content = result.anonymized
-                    mapping = result.mapping
-                else:
-                    anonymized_content, mapping = self.guard.anonymize(message["content"])
-
-                anonymized_messages.append({
-                    **message,
-                    "content": anonymized_content,
-                })
-                combined_mapping.update(mapping)
-            else:
-                anonymized_messages.append(message)
+        # Anonymize all string contents in one batch; an async guard runs
+        # them concurrently instead of one message after another
+        indices = [
+            i for i, message in enumerate(messages)
+            if isinstance(message.get("content"), str)
+        ]
+        results = await self._anonymize_all(
+            [messages[i]["content"] for i in indices]
+        )
+
+        anonymized_messages = list(messages)
+        for i, (anonymized_content, _) in zip(indices, results):
+            message = messages[i]
+            if copy_messages:
+                message = anonymized_messages[i] = message.copy()
+            message["content"] = anonymized_content
+
+        # Placeholders are shared across the batch, so the per-message
+        # mappings never disagree and merge in one pass
+        combined_mapping = {
+            placeholder: original
+            for _, mapping in results
+            for placeholder, original in mapping.items()
+        }
 
         return anonymized_messages, combined_mapping
 
@@ -89,6 +133,9 @@ class VercelAIAdapter:
         """
         Protect streaming response by de-anonymizing chunks.
 
+        A placeholder split across chunks is held back until it completes,
+        so chunk boundaries do not change what is restored.
+
         Args:
             stream: Async iterator of response chunks
             mapping: PII mapping to use for de-anonymization
@@ -96,10 +143,21 @@ class VercelAIAdapter:
         Yields:
             De-anonymized chunks
         """
+        if not (self.deanonymize_response and mapping):
+            async for chunk in stream:
+                yield chunk
+            return
+
+        # Hold back a trailing partial placeholder until it completes
+        pending = ""
         async for chunk in stream:
-            if self.deanonymize_response and mapping:
-                chunk = self.guard.deanonymize(chunk, mapping)
-            yield chunk
+            pending += chunk
+            end = _stream_safe_end(pending, mapping)
+            if end:
+                yield self.guard.deanonymize(pending[:end], mapping)
+                pending = pending[end:]
+        if pending:
+            yield self.guard.deanonymize(pending, mapping)
 
     async def protect_function_call(
         self, function_name: str, arguments: Dict[str, Any]
@@ -114,18 +172,18 @@ class VercelAIAdapter:
         Returns:
             Tuple of (function_name, anonymized_arguments, mapping)
         """
-        # Serialize arguments to detect PII
-        args_str = json.dumps(arguments, ensure_ascii=False)
-
-        if self._is_async:
-            result = await self.guard.anonymize_async(args_str)
-            anonymized_str = result.anonymized
-            mapping = result.mapping
-        else:
-            anonymized_str, mapping = self.guard.anonymize(args_str)
+        # Anonymize only the strings in the arguments, not the JSON syntax
+        # around them; placeholders are shared so the mappings merge cleanly
+        results = await self._anonymize_all(_string_leaves(arguments, []))
+        mapping = {
+            placeholder: original
+            for _, result_mapping in results
+            for placeholder, original in result_mapping.items()
+        }
 
-        # Parse back to dict
-        anonymized_arguments = json.loads(anonymized_str)
+        anonymized_arguments = _replace_leaves(
+            arguments, (anonymized for anonymized, _ in results)
+        )
 
         return function_name, anonymized_arguments, mapping
 
@@ -234,11 +292,12 @@ class ProtectedStreamingChat:
             "This adapter provides the Python-side PII protection logic."
         )
 
-        # Simulate streaming response (in production, call actual LLM)
+        # Simulate streaming response (in production, call actual LLM and
+        # pass its chunks through); one chunk per word, not per character
         response_text = "This is a simulated response."
-        for char in response_text:
-            await asyncio.sleep(0.01)  # Simulate streaming delay
-            yield char
+        for word in re.split(r"(?<=\s)(?=\S)", response_text):
+            await asyncio.sleep(0)  # Let other tasks run between chunks
+            yield word
 
     async def complete(
         self, messages: List[Dict[str, Any]], **kwargs
@@ -2,21 +2,40 @@
 Anonymization strategies for PII replacement.
 """
 
+import importlib
+import importlib.util
+
 from .base import AnonymizationStrategy, BaseAnonymizer
 from .hash import HashAnonymizer
 from .mask import MaskAnonymizer
 
-try:
-    from .synthetic import SyntheticAnonymizer
-    SYNTHETIC_AVAILABLE = True
-except ImportError:
-    SYNTHETIC_AVAILABLE = False
+# Strategies backed by heavy optional libraries (Faker, cryptography's
+# OpenSSL bindings) are imported on first attribute access (PEP 562), so
+# importing this package does not load them.
+SYNTHETIC_AVAILABLE = importlib.util.find_spec("faker") is not None
+ENCRYPT_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+
+# Lazily imported name -> module defining it
+_LAZY_IMPORTS = {
+    "SyntheticAnonymizer": ".synthetic",
+    "EncryptAnonymizer": ".encrypt",
+}
+
+
+def __getattr__(name: str):
+    """Import optional strategies on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-try:
-    from .encrypt import EncryptAnonymizer
-    ENCRYPT_AVAILABLE = True
-except ImportError:
-    ENCRYPT_AVAILABLE = False
 
 __all__ = [
     "AnonymizationStrategy",
@@ -30,4 +49,3 @@ if SYNTHETIC_AVAILABLE:
 
 if ENCRYPT_AVAILABLE:
     __all__.append("EncryptAnonymizer")
-
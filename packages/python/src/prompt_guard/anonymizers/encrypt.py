@@ -3,11 +3,13 @@ Encryption-based anonymization for reversible protection.
 """
 
 import base64
+import os
 from typing import Dict, Optional
 from .base import BaseAnonymizer
 
 try:
     from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM, AESSIV
     CRYPTOGRAPHY_AVAILABLE = True
 except ImportError:
     CRYPTOGRAPHY_AVAILABLE = False
@@ -23,15 +25,34 @@ class EncryptAnonymizer(BaseAnonymizer):
     - Key management support
     - Suitable for secure storage
     
+    With ``fast_mode=True`` values are encrypted with AES-256-GCM instead
+    of Fernet (AES-CBC plus HMAC-SHA256): one AEAD pass per value, with a
+    random 96-bit nonce prepended to the ciphertext. Values are still
+    reversible with the key, but are not Fernet tokens.
+    
+    With ``deterministic=True`` values are encrypted with AES-SIV, so the
+    same value always yields the same ciphertext and repeats are served
+    from a cache. This reveals which encrypted values are equal; use it
+    only when that is acceptable (e.g., joining on encrypted columns).
+    
     Note: Keep the encryption key secure! Loss of key means data cannot be recovered.
     """
     
-    def __init__(self, encryption_key: Optional[bytes] = None):
+    def __init__(
+        self,
+        encryption_key: Optional[bytes] = None,
+        fast_mode: bool = False,
+        deterministic: bool = False,
+    ):
         """
         Initialize encryption anonymizer.
         
         Args:
-            encryption_key: Fernet encryption key (generates new if None)
+            encryption_key: Fernet encryption key, a raw 16/24/32-byte AES
+                key in fast mode, or a raw 32/48/64-byte AES-SIV key in
+                deterministic mode (generates new if None)
+            fast_mode: Encrypt with AES-GCM instead of Fernet
+            deterministic: Encrypt with AES-SIV so equal values encrypt equally
         """
         if not CRYPTOGRAPHY_AVAILABLE:
             raise ImportError(
@@ -39,14 +60,31 @@ class EncryptAnonymizer(BaseAnonymizer):
                 "Install it with: pip install cryptography"
             )
         
+        if fast_mode and deterministic:
+            raise ValueError("fast_mode and deterministic are mutually exclusive")
+        
+        self.fast_mode = fast_mode
+        self.deterministic = deterministic
+        
         if encryption_key is None:
             # Generate new key
-            self.key = Fernet.generate_key()
+            if deterministic:
+                self.key = AESSIV.generate_key(bit_length=512)
+            elif fast_mode:
+                self.key = AESGCM.generate_key(bit_length=256)
+            else:
+                self.key = Fernet.generate_key()
         else:
             self.key = encryption_key
         
-        self.cipher = Fernet(self.key)
+        if deterministic:
+            self.cipher = AESSIV(self.key)
+        elif fast_mode:
+            self.cipher = AESGCM(self.key)
+        else:
+            self.cipher = Fernet(self.key)
         self._mapping: Dict[str, str] = {}
+        self._original_to_encrypted: Dict[str, str] = {}
     
     def anonymize_entity(
         self,
@@ -65,11 +103,28 @@ class EncryptAnonymizer(BaseAnonymizer):
         Returns:
             Encrypted value (base64 encoded)
         """
+        # Deterministic ciphertexts of values seen before are reused
+        if self.deterministic:
+            cached = self._original_to_encrypted.get(original_value)
+            if cached is not None:
+                return cached
+        
         # Encrypt
-        encrypted_bytes = self.cipher.encrypt(original_value.encode('utf-8'))
+        if self.deterministic:
+            encrypted_bytes = self.cipher.encrypt(original_value.encode('utf-8'), None)
+        elif self.fast_mode:
+            # Random nonces: a counter would repeat across instances sharing a key
+            nonce = os.urandom(12)
+            encrypted_bytes = nonce + self.cipher.encrypt(
+                nonce, original_value.encode('utf-8'), None
+            )
+        else:
+            encrypted_bytes = self.cipher.encrypt(original_value.encode('utf-8'))
         encrypted_str = base64.urlsafe_b64encode(encrypted_bytes).decode('utf-8')
         
         self._mapping[encrypted_str] = original_value
+        if self.deterministic:
+            self._original_to_encrypted[original_value] = encrypted_str
         return encrypted_str
     
     def deanonymize_value(self, encrypted_value: str) -> str:
@@ -83,6 +138,11 @@ class EncryptAnonymizer(BaseAnonymizer):
             Original decrypted value
         """
         encrypted_bytes = base64.urlsafe_b64decode(encrypted_value.encode('utf-8'))
+        if self.deterministic:
+            return self.cipher.decrypt(encrypted_bytes, None).decode('utf-8')
+        if self.fast_mode:
+            nonce, ciphertext = encrypted_bytes[:12], encrypted_bytes[12:]
+            return self.cipher.decrypt(nonce, ciphertext, None).decode('utf-8')
         decrypted = self.cipher.decrypt(encrypted_bytes).decode('utf-8')
         return decrypted
     
@@ -102,4 +162,5 @@ class EncryptAnonymizer(BaseAnonymizer):
     def reset(self):
         """Reset all mappings."""
         self._mapping.clear()
+        self._original_to_encrypted.clear()
 
@@ -3,9 +3,20 @@ Hash-based anonymization for analytics use cases.
 """
 
 import hashlib
-from typing import Dict, Optional
+from functools import partial
+from typing import Dict, List, Optional
 from .base import BaseAnonymizer
 
+# Hash constructor per supported algorithm; BLAKE2b is cut to 256 bits so
+# hashes are as long as SHA-256's
+_HASH_CONSTRUCTORS = {
+    "blake2b": partial(hashlib.blake2b, digest_size=32),
+    "blake2s": hashlib.blake2s,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "md5": hashlib.md5,
+}
+
 
 class HashAnonymizer(BaseAnonymizer):
     """
@@ -16,12 +27,16 @@ class HashAnonymizer(BaseAnonymizer):
     - Suitable for analytics and aggregation
     - One-way transformation (cannot reverse without rainbow tables)
     - Optional salt for additional security
-    - Multiple hash algorithms (SHA256, SHA512, MD5)
+    - Multiple hash algorithms (BLAKE2b, BLAKE2s, SHA256, SHA512, MD5)
+    
+    BLAKE2b (256-bit digest) is the default: faster than SHA-256 in
+    software while still cryptographic. Use ``algorithm="sha256"`` when
+    hashes must match other SHA-256 based systems or earlier versions.
     """
     
     def __init__(
         self,
-        algorithm: str = "sha256",
+        algorithm: str = "blake2b",
         salt: Optional[str] = None,
         truncate: Optional[int] = None,
     ):
@@ -29,7 +44,7 @@ class HashAnonymizer(BaseAnonymizer):
         Initialize hash anonymizer.
         
         Args:
-            algorithm: Hash algorithm ("sha256", "sha512", "md5")
+            algorithm: Hash algorithm ("blake2b", "blake2s", "sha256", "sha512", "md5")
             salt: Optional salt to add to values before hashing
             truncate: Optional number of characters to keep from hash
         """
@@ -37,14 +52,19 @@ class HashAnonymizer(BaseAnonymizer):
         self.salt = salt or ""
         self.truncate = truncate
         
-        if self.algorithm not in ("sha256", "sha512", "md5"):
+        if self.algorithm not in _HASH_CONSTRUCTORS:
             raise ValueError(
                 f"Unsupported algorithm: {algorithm}. "
-                "Supported: sha256, sha512, md5"
+                "Supported: blake2b, blake2s, sha256, sha512, md5"
             )
         
+        # Context with the salt already absorbed, copied for each value so
+        # hashing needs no algorithm dispatch nor re-hashing the salt
+        self._salted = _HASH_CONSTRUCTORS[self.algorithm](self.salt.encode('utf-8'))
+        
         self._mapping: Dict[str, str] = {}
         self._hashed_to_original: Dict[str, str] = {}
+        self._original_to_hashed: Dict[str, str] = {}
     
     def anonymize_entity(
         self,
@@ -63,16 +83,14 @@ class HashAnonymizer(BaseAnonymizer):
         Returns:
             Hashed value
         """
-        # Compute hash
-        salted_value = f"{self.salt}{original_value}".encode('utf-8')
-        
-        if self.algorithm == "sha256":
-            hash_obj = hashlib.sha256(salted_value)
-        elif self.algorithm == "sha512":
-            hash_obj = hashlib.sha512(salted_value)
-        else:  # md5
-            hash_obj = hashlib.md5(salted_value)
+        # Values seen before hash to the same value; skip re-hashing them
+        cached = self._original_to_hashed.get(original_value)
+        if cached is not None:
+            return cached
         
+        # Compute hash
+        hash_obj = self._salted.copy()
+        hash_obj.update(original_value.encode('utf-8'))
         hashed = hash_obj.hexdigest()
         
         # Truncate if requested
@@ -80,11 +98,46 @@ class HashAnonymizer(BaseAnonymizer):
             hashed = hashed[:self.truncate]
         
         # Store mapping (for informational purposes, cannot reverse)
+        self._original_to_hashed[original_value] = hashed
         self._hashed_to_original[hashed] = original_value
         self._mapping[hashed] = original_value
         
         return hashed
     
+    def anonymize_batch(self, values: List[str]) -> List[str]:
+        """
+        Replace many values with their hashes.
+        
+        Args:
+            values: Original PII values
+        
+        Returns:
+            Hashed values, in input order
+        """
+        seen = self._original_to_hashed
+        copy = self._salted.copy
+        truncate = self.truncate
+        
+        hashes = []
+        append = hashes.append
+        for value in values:
+            hashed = seen.get(value)
+            if hashed is None:
+                # Compute hash, truncated if requested
+                hash_obj = copy()
+                hash_obj.update(value.encode('utf-8'))
+                hashed = hash_obj.hexdigest()
+                if truncate:
+                    hashed = hashed[:truncate]
+                
+                # Store mapping (for informational purposes, cannot reverse)
+                seen[value] = hashed
+                self._hashed_to_original[hashed] = value
+                self._mapping[hashed] = value
+            append(hashed)
+        
+        return hashes
+    
     def get_mapping(self) -> Dict[str, str]:
         """
         Get mapping from hashed to original values.
@@ -97,4 +150,5 @@ class HashAnonymizer(BaseAnonymizer):
         """Reset all mappings."""
         self._mapping.clear()
         self._hashed_to_original.clear()
+        self._original_to_hashed.clear()
 
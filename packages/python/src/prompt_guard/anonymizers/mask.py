@@ -2,9 +2,22 @@
 Masking-based anonymization for partial redaction.
 """
 
+import re
+from functools import lru_cache
 from typing import Dict
 from .base import BaseAnonymizer
 
+# Characters kept as-is when preserving structure
+_PRESERVE_CHARS = frozenset("@.-_:/() ")
+_MASKABLE_RE = re.compile(r"[^@.\-_:/() ]")
+_ASCII_MASKABLE = [chr(c) for c in range(128) if chr(c) not in _PRESERVE_CHARS]
+
+
+@lru_cache(maxsize=64)
+def _reveal_pattern(count: int) -> "re.Pattern[str]":
+    """Pattern matching a prefix holding ``count`` non-structural characters."""
+    return re.compile(r"(?:[@.\-_:/() ]*[^@.\-_:/() ]){%d}" % count)
+
 
 class MaskAnonymizer(BaseAnonymizer):
     """
@@ -42,6 +55,10 @@ class MaskAnonymizer(BaseAnonymizer):
         self.reveal_first = reveal_first
         self.reveal_last = reveal_last
         self.preserve_structure = preserve_structure
+        # Masks every non-structural character: a translation table for
+        # ASCII text, a re.sub() replacement (escaped) otherwise
+        self._mask_table = str.maketrans(dict.fromkeys(_ASCII_MASKABLE, mask_char))
+        self._mask_repl = mask_char.replace("\\", "\\\\")
         
         self._mapping: Dict[str, str] = {}
     
@@ -87,30 +104,33 @@ class MaskAnonymizer(BaseAnonymizer):
     
     def _mask_with_structure(self, value: str) -> str:
         """Mask while preserving special characters."""
-        # Characters to preserve
-        preserve_chars = set("@.-_:/() ")
+        # Nothing revealed: the whole value is one translate() for ASCII text
+        if not (self.reveal_first or self.reveal_last) and value.isascii():
+            return value.translate(self._mask_table)
         
-        result = []
-        char_count = 0
+        # Span between the revealed leading and trailing characters; the
+        # boundaries are found by regex so no Python loop runs per character
+        start = 0
+        end = len(value)
+        if self.reveal_first:
+            match = _reveal_pattern(self.reveal_first).match(value)
+            if match is None:
+                return value
+            start = match.end()
+        if self.reveal_last:
+            match = _reveal_pattern(self.reveal_last).match(value[::-1])
+            if match is None:
+                return value
+            end -= match.end()
+        if start >= end:
+            return value
         
-        for char in value:
-            if char in preserve_chars:
-                # Keep special characters
-                result.append(char)
-            else:
-                # Determine if this character should be revealed or masked
-                total_chars = sum(1 for c in value if c not in preserve_chars)
-                
-                if char_count < self.reveal_first:
-                    result.append(char)
-                elif char_count >= total_chars - self.reveal_last:
-                    result.append(char)
-                else:
-                    result.append(self.mask_char)
-                
-                char_count += 1
-        
-        return ''.join(result)
+        span = value[start:end]
+        if span.isascii():
+            span = span.translate(self._mask_table)
+        else:
+            span = _MASKABLE_RE.sub(self._mask_repl, span)
+        return value[:start] + span + value[end:]
     
     def get_mapping(self) -> Dict[str, str]:
         """Get mapping from masked to original values."""
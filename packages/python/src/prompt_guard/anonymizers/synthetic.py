@@ -3,7 +3,10 @@ Synthetic data replacement using Faker library.
 """
 
 import hashlib
-from typing import Dict, Optional
+import zlib
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, Optional
 from .base import BaseAnonymizer
 
 try:
@@ -13,6 +16,89 @@ except ImportError:
     FAKER_AVAILABLE = False
 
 
+def _phone(fake, original: str) -> str:
+    # Try to preserve format
+    if "-" in original:
+        return fake.phone_number()
+    return fake.phone_number().replace("-", "")
+
+
+def _ip_address(fake, original: str) -> str:
+    if ":" in original:  # IPv6
+        return fake.ipv6()
+    return fake.ipv4()
+
+
+# Generator per entity type; unknown types fall back to a word
+_GENERATORS: Dict[str, Callable[[object, str], str]] = {
+    "PERSON": lambda fake, original: fake.name(),
+    "NAME": lambda fake, original: fake.name(),
+    "EMAIL": lambda fake, original: fake.email(),
+    "PHONE": _phone,
+    "PHONE_NUMBER": _phone,
+    "SSN": lambda fake, original: fake.ssn(),
+    "CREDIT_CARD": lambda fake, original: fake.credit_card_number(),
+    "ADDRESS": lambda fake, original: fake.address().replace("\n", ", "),
+    "LOCATION": lambda fake, original: fake.address().replace("\n", ", "),
+    "CITY": lambda fake, original: fake.city(),
+    "STATE": lambda fake, original: fake.state(),
+    "COUNTRY": lambda fake, original: fake.country(),
+    "ZIP_CODE": lambda fake, original: fake.zipcode(),
+    "COMPANY": lambda fake, original: fake.company(),
+    "IP_ADDRESS": _ip_address,
+    "URL": lambda fake, original: fake.url(),
+    "USERNAME": lambda fake, original: fake.user_name(),
+    "DATE": lambda fake, original: str(fake.date()),
+    "TIME": lambda fake, original: str(fake.time()),
+}
+
+
+def _fallback(fake, original: str) -> str:
+    return fake.word()
+
+
+# One Faker per locale, shared by all anonymizers; reseeding and generating
+# must not interleave between threads
+_FAKERS: Dict[str, "Faker"] = {}
+_FAKER_LOCK = Lock()
+
+
+def _faker(locale: str) -> "Faker":
+    """Return the shared Faker instance for a locale."""
+    fake = _FAKERS.get(locale)
+    if fake is None:
+        fake = _FAKERS.setdefault(locale, Faker(locale))
+    return fake
+
+
+@lru_cache(maxsize=8192)
+def _synthesize(
+    locale: str,
+    entity_type: str,
+    original_value: str,
+    md5_seed: bool = False,
+) -> str:
+    """
+    Generate the synthetic value for an original value.
+
+    The Faker instance is seeded from the original value, so the result
+    only depends on the arguments and repeats across calls and anonymizer
+    instances are served from the cache.
+    """
+    # Create deterministic seed from original value; CRC32 is enough since
+    # the seed only drives Faker, MD5 reproduces earlier versions' values
+    encoded = original_value.encode("utf-8")
+    if md5_seed:
+        seed_value = int(hashlib.md5(encoded).hexdigest()[:8], 16)
+    else:
+        seed_value = zlib.crc32(encoded)
+    generate = _GENERATORS.get(entity_type, _fallback)
+    fake = _faker(locale)
+    with _FAKER_LOCK:
+        fake.seed_instance(seed_value)
+        return generate(fake, original_value)
+
+
 class SyntheticAnonymizer(BaseAnonymizer):
     """
     Anonymizer that replaces PII with realistic synthetic data.
@@ -31,13 +117,20 @@ class SyntheticAnonymizer(BaseAnonymizer):
     - Format-preserving where possible
     """
     
-    def __init__(self, locale: str = "en_US", seed: Optional[int] = None):
+    def __init__(
+        self,
+        locale: str = "en_US",
+        seed: Optional[int] = None,
+        md5_seed: bool = False,
+    ):
         """
         Initialize synthetic anonymizer.
         
         Args:
             locale: Faker locale for generating data (e.g., "en_US", "fr_FR", "de_DE")
             seed: Random seed for deterministic generation
+            md5_seed: Seed Faker from an MD5 of the original value instead of
+                CRC32, reproducing values generated by earlier versions
         """
         if not FAKER_AVAILABLE:
             raise ImportError(
@@ -46,7 +139,8 @@ class SyntheticAnonymizer(BaseAnonymizer):
             )
         
         self.locale = locale
-        self.fake = Faker(locale)
+        self.md5_seed = md5_seed
+        self.fake = _faker(locale)
         
         if seed is not None:
             Faker.seed(seed)
@@ -103,69 +197,7 @@ class SyntheticAnonymizer(BaseAnonymizer):
         Returns:
             Synthetic value
         """
-        # Create deterministic seed from original value
-        seed_value = int(hashlib.md5(original_value.encode()).hexdigest()[:8], 16)
-        self.fake.seed_instance(seed_value)
-        
-        # Generate based on entity type
-        if entity_type in ("PERSON", "NAME"):
-            return self.fake.name()
-        
-        elif entity_type == "EMAIL":
-            return self.fake.email()
-        
-        elif entity_type in ("PHONE", "PHONE_NUMBER"):
-            # Try to preserve format
-            if "-" in original_value:
-                return self.fake.phone_number()
-            else:
-                return self.fake.phone_number().replace("-", "")
-        
-        elif entity_type == "SSN":
-            return self.fake.ssn()
-        
-        elif entity_type == "CREDIT_CARD":
-            return self.fake.credit_card_number()
-        
-        elif entity_type in ("ADDRESS", "LOCATION"):
-            return self.fake.address().replace("\n", ", ")
-        
-        elif entity_type == "CITY":
-            return self.fake.city()
-        
-        elif entity_type == "STATE":
-            return self.fake.state()
-        
-        elif entity_type == "COUNTRY":
-            return self.fake.country()
-        
-        elif entity_type == "ZIP_CODE":
-            return self.fake.zipcode()
-        
-        elif entity_type == "COMPANY":
-            return self.fake.company()
-        
-        elif entity_type == "IP_ADDRESS":
-            if ":" in original_value:  # IPv6
-                return self.fake.ipv6()
-            else:  # IPv4
-                return self.fake.ipv4()
-        
-        elif entity_type == "URL":
-            return self.fake.url()
-        
-        elif entity_type == "USERNAME":
-            return self.fake.user_name()
-        
-        elif entity_type == "DATE":
-            return str(self.fake.date())
-        
-        elif entity_type == "TIME":
-            return str(self.fake.time())
-        
-        else:
-            # Fallback: generate a word
-            return self.fake.word()
+        return _synthesize(self.locale, entity_type, original_value, self.md5_seed)
     
     def get_mapping(self) -> Dict[str, str]:
         """
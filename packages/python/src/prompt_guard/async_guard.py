@@ -11,15 +11,21 @@ This module provides AsyncPromptGuard which supports:
 from __future__ import annotations
 
 import asyncio
+import sys
 from typing import List, Dict, Tuple, Any, AsyncIterator, Optional
 import pathlib
-import yaml
 
 from .detectors.regex_detector import RegexDetector
+from .guard import _deanonymize, _read_policy
 from .types import DetectorResult, Mapping, AnonymizeResult, AnonymizeOptions, DetectionReport
 from .report import generate_detection_report
 
 
+# Regex-only detection on texts shorter than this runs inline on the event
+# loop: it takes microseconds, less than handing it to an executor thread.
+EXECUTOR_MIN_TEXT_LENGTH = 4096
+
+
 class AsyncPromptGuard:
     """
     Async version of PromptGuard for async/await patterns.
@@ -51,6 +57,16 @@ class AsyncPromptGuard:
         """
         self.detectors = self._init_detectors(detectors or ["regex"])
         self.policy = self._load_policy(policy, custom_policy_path)
+        # Placeholder template of each configured entity type, resolved once
+        self._placeholder_templates: Dict[str, str] = {
+            entity_type: entity_cfg.get("placeholder", f"[{entity_type}_{{i}}]")
+            for entity_type, entity_cfg in self.policy.get("entities", {}).items()
+            if entity_cfg
+        }
+        # ML detectors can take long on any text, so they always run off-loop
+        self._inline_detection = all(
+            isinstance(detector, RegexDetector) for detector in self.detectors
+        )
         self.max_concurrent = max_concurrent
         self._semaphore = asyncio.Semaphore(max_concurrent)
 
@@ -60,6 +76,14 @@ class AsyncPromptGuard:
         for name in names:
             if name == "regex":
                 instances.append(RegexDetector())
+            elif name == "re2":
+                try:
+                    instances.append(RegexDetector(engine="re2"))
+                except ImportError:
+                    raise ValueError(
+                        "RE2 regex detector is not available. "
+                        "Install it with: pip install google-re2"
+                    )
             elif name == "presidio":
                 try:
                     from .detectors.presidio_detector import PresidioDetector
@@ -72,7 +96,7 @@ class AsyncPromptGuard:
             else:
                 raise ValueError(
                     f"Unknown detector backend: {name}. "
-                    f"Currently supported: ['regex', 'presidio']"
+                    f"Currently supported: ['regex', 're2', 'presidio']"
                 )
         return instances
 
@@ -90,8 +114,7 @@ class AsyncPromptGuard:
         if not policy_path.exists():
             raise FileNotFoundError(f"Policy file not found: {policy_path}")
 
-        with policy_path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return _read_policy(policy_path)
 
     async def anonymize_async(
         self,
@@ -108,15 +131,19 @@ class AsyncPromptGuard:
         Returns:
             A tuple of (anonymized_text, mapping)
         """
-        # Run detection in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        all_results = await loop.run_in_executor(
-            None, self._run_detectors, text
-        )
+        all_results = await self._detect(text)
 
         # Process results (this is fast, so we can do it inline)
         return self._anonymize_with_results(text, all_results, options)
 
+    async def _detect(self, text: str) -> List[DetectorResult]:
+        """Run all detectors, in an executor unless that costs more than it saves."""
+        if self._inline_detection and len(text) < EXECUTOR_MIN_TEXT_LENGTH:
+            return self._run_detectors(text)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._run_detectors, text
+        )
+
     def _run_detectors(self, text: str) -> List[DetectorResult]:
         """Run all detectors on the text."""
         all_results: List[DetectorResult] = []
@@ -129,8 +156,20 @@ class AsyncPromptGuard:
         text: str,
         all_results: List[DetectorResult],
         options: Optional[AnonymizeOptions] = None,
+        entities: Optional[Dict[Tuple[str, str], str]] = None,
+        counters: Optional[Dict[str, int]] = None,
     ) -> AnonymizeResult:
-        """Anonymize text using detection results."""
+        """
+        Anonymize text using detection results.
+
+        ``entities`` ((entity type, original) -> placeholder) and
+        ``counters`` (last index per entity type) may be shared across calls so that texts reuse
+        each other's placeholders and never collide.
+        """
+        # Nothing to replace: return the text as-is
+        if not all_results:
+            return text, {}
+
         if options is None:
             options = AnonymizeOptions()
 
@@ -144,37 +183,52 @@ class AsyncPromptGuard:
         # Sort by start index for stable replacements
         all_results.sort(key=lambda r: r.start)
 
-        policy_entities = self.policy.get("entities", {})
+        templates = self._placeholder_templates
         mapping: Mapping = {}
         anonymized = []
+        append = anonymized.append
         last_idx = 0
 
+        # Placeholder per entity type and original value, so repeats share
+        # one placeholder
+        if entities is None:
+            entities = {}
         # Counter per entity type
-        counters: Dict[str, int] = {}
+        if counters is None:
+            counters = {}
 
         for res in all_results:
-            entity_cfg = policy_entities.get(res.entity_type)
-            if not entity_cfg:
+            entity_type = res.entity_type
+            placeholder_tpl = templates.get(entity_type)
+            if placeholder_tpl is None:
                 continue  # skip unconfigured entity types
 
-            # Add text before this entity
-            anonymized.append(text[last_idx : res.start])
+            # Add text before this entity; adjacent entities leave none
+            if res.start > last_idx:
+                append(text[last_idx : res.start])
 
-            # Compute placeholder
-            counters[res.entity_type] = counters.get(res.entity_type, 0) + 1
-            i = counters[res.entity_type]
-            placeholder_tpl = entity_cfg.get(
-                "placeholder", f"[{res.entity_type}_{{i}}]"
-            )
-            placeholder = placeholder_tpl.format(i=i)
+            # Results without text of their own (e.g. merged spans) take the span
+            original = res.text or text[res.start : res.end]
 
-            anonymized.append(placeholder)
-            mapping[placeholder] = res.text
+            # Compute placeholder, reusing the one of a value seen before
+            # as the same entity type
+            key = (entity_type, original)
+            placeholder = entities.get(key) if original else None
+            if placeholder is None:
+                i = counters[entity_type] = counters.get(entity_type, 0) + 1
+                # Interned so the same placeholder across texts and mappings
+                # is one object, letting dict probes match on identity
+                placeholder = sys.intern(placeholder_tpl.format(i=i))
+                if original:
+                    entities[key] = placeholder
+
+            append(placeholder)
+            mapping[placeholder] = original
 
             last_idx = res.end
 
         # Add trailing text
-        anonymized.append(text[last_idx:])
+        append(text[last_idx:])
 
         return "".join(anonymized), mapping
 
@@ -201,11 +255,7 @@ class AsyncPromptGuard:
         Returns:
             DetectionReport with statistics and risk assessment
         """
-        # Run detection in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        all_results = await loop.run_in_executor(
-            None, self._run_detectors, text
-        )
+        all_results = await self._detect(text)
         
         # Filter by confidence if specified
         if min_confidence is not None and min_confidence > 0:
@@ -215,7 +265,7 @@ class AsyncPromptGuard:
             ]
         
         # Generate report in executor
-        return await loop.run_in_executor(
+        return await asyncio.get_running_loop().run_in_executor(
             None, generate_detection_report, text, all_results, include_preview
         )
 
@@ -230,15 +280,13 @@ class AsyncPromptGuard:
         Returns:
             Text with placeholders replaced by original values
         """
-        result = text
-        for placeholder, original in mapping.items():
-            result = result.replace(placeholder, original)
-        return result
+        return _deanonymize(text, mapping)
 
     async def batch_anonymize(
         self,
         texts: List[str],
         options: Optional[AnonymizeOptions] = None,
+        share_placeholders: bool = False,
     ) -> List[AnonymizeResult]:
         """
         Anonymize multiple texts concurrently.
@@ -246,16 +294,35 @@ class AsyncPromptGuard:
         Args:
             texts: List of texts to anonymize
             options: Anonymization options
+            share_placeholders: Number placeholders across the whole batch, so
+                a value gets the same placeholder in every text and different
+                values never share one (e.g., messages of one conversation
+                whose mappings are combined)
 
         Returns:
             List of (anonymized_text, mapping) tuples
         """
-        async def _anonymize_one(text: str) -> AnonymizeResult:
+        if not share_placeholders:
+            async def _anonymize_one(text: str) -> AnonymizeResult:
+                async with self._semaphore:
+                    return await self.anonymize_async(text, options)
+
+            tasks = [_anonymize_one(text) for text in texts]
+            return await asyncio.gather(*tasks)
+
+        # Detection still runs concurrently; placeholders are then assigned
+        # in text order so numbering is deterministic
+        async def _detect_one(text: str) -> List[DetectorResult]:
             async with self._semaphore:
-                return await self.anonymize_async(text, options)
+                return await self._detect(text)
 
-        tasks = [_anonymize_one(text) for text in texts]
-        return await asyncio.gather(*tasks)
+        all_results = await asyncio.gather(*(_detect_one(text) for text in texts))
+        entities: Dict[Tuple[str, str], str] = {}
+        counters: Dict[str, int] = {}
+        return [
+            self._anonymize_with_results(text, results, options, entities, counters)
+            for text, results in zip(texts, all_results)
+        ]
 
     async def stream_anonymize(
         self,
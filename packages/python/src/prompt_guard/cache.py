@@ -6,7 +6,8 @@ Supports multiple backend: in-memory, Redis, and custom implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
 import hashlib
 import json
 import time
@@ -54,7 +55,7 @@ class CacheBackend(ABC):
 
 class InMemoryCache(CacheBackend):
     """
-    Simple in-memory cache using a dictionary.
+    Simple in-memory LRU cache using an ordered dictionary.
 
     Good for:
     - Single-process applications
@@ -73,24 +74,28 @@ class InMemoryCache(CacheBackend):
         Args:
             max_size: Maximum number of entries to cache
         """
-        self.cache: Dict[str, CacheEntry] = {}
+        # Least recently used first
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.max_size = max_size
 
     def get(self, key: str) -> Optional[CacheEntry]:
         """Get a value from the cache."""
         entry = self.cache.get(key)
-        if entry and entry.is_expired():
+        if entry is None:
+            return None
+        if entry.is_expired():
             del self.cache[key]
             return None
+        self.cache.move_to_end(key)
         return entry
 
     def set(self, key: str, entry: CacheEntry) -> None:
         """Set a value in the cache."""
-        # Simple LRU: remove oldest if at capacity
-        if len(self.cache) >= self.max_size:
-            # Remove the first (oldest) entry
-            first_key = next(iter(self.cache))
-            del self.cache[first_key]
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.max_size:
+            # Remove the least recently used entry
+            self.cache.popitem(last=False)
 
         self.cache[key] = entry
 
@@ -211,18 +216,18 @@ def create_cache_key(text: str, policy: str, detectors: list) -> str:
         detectors: List of detector names
 
     Returns:
-        SHA-256 hash as cache key
+        256-bit BLAKE2b hash as cache key
     """
-    # Create a deterministic string representation
-    key_data = {
-        "text": text,
-        "policy": policy,
-        "detectors": sorted(detectors),
-    }
-    key_str = json.dumps(key_data, sort_keys=True)
-
-    # Hash it
-    return hashlib.sha256(key_str.encode()).hexdigest()
+    # Hash the configuration (small, JSON for an unambiguous encoding), then
+    # the text itself, which is never copied into an intermediate string.
+    # NUL cannot occur in JSON output, so it cleanly ends the header. Kept
+    # cryptographic: a colliding key would serve another text's mapping.
+    key_hash = hashlib.blake2b(
+        json.dumps([policy, sorted(detectors)]).encode(), digest_size=32
+    )
+    key_hash.update(b"\0")
+    key_hash.update(text.encode())
+    return key_hash.hexdigest()
 
 
 class CachedPromptGuard:
@@ -303,10 +308,41 @@ class CachedPromptGuard:
 
         return anonymized, mapping
 
+    def batch_anonymize(
+        self,
+        texts: List[str],
+        use_cache: bool = True,
+        share_placeholders: bool = False,
+    ):
+        """
+        Anonymize multiple texts with caching.
+
+        Args:
+            texts: Texts to anonymize
+            use_cache: Whether to use cache
+            share_placeholders: Number placeholders across the whole batch
+                (see PromptGuard.batch_anonymize); such results depend on
+                the other texts and are not cached
+
+        Returns:
+            List of (anonymized_text, mapping) tuples
+        """
+        if share_placeholders:
+            return self.guard.batch_anonymize(texts, share_placeholders=True)
+        if not use_cache:
+            return self.guard.batch_anonymize(texts)
+        return [self.anonymize(text) for text in texts]
+
     def deanonymize(self, text: str, mapping: Dict[str, str]) -> str:
         """De-anonymize text (no caching needed)."""
         return self.guard.deanonymize(text, mapping)
 
+    def batch_deanonymize(
+        self, texts: List[str], mappings: List[Dict[str, str]]
+    ) -> List[str]:
+        """De-anonymize multiple texts (no caching needed)."""
+        return self.guard.batch_deanonymize(texts, mappings)
+
     def clear_cache(self) -> None:
         """Clear all cache entries."""
         self.cache.clear()
@@ -1,9 +1,12 @@
 from .base import BaseDetector
 from .regex_detector import RegexDetector
 
-# Optional detectors
-try:
-    from .presidio_detector import PresidioDetector
-    __all__ = ["BaseDetector", "RegexDetector", "PresidioDetector"]
-except ImportError:
-    __all__ = ["BaseDetector", "RegexDetector"]
+__all__ = ["BaseDetector", "RegexDetector", "PresidioDetector"]
+
+
+def __getattr__(name: str):
+    # Presidio loads spaCy models; import it only when requested
+    if name == "PresidioDetector":
+        from .presidio_detector import PresidioDetector
+        return PresidioDetector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -215,6 +215,16 @@ class EnhancedRegexDetector(BaseDetector):
             (CRYPTO_ETH_RE, "CRYPTO_ADDRESS", 95),
         ]
 
+        # Enabled patterns by priority (descending), resolved once here
+        # rather than sorted and filtered on every detect() call
+        self._active_patterns = [
+            (pattern, entity_type, priority)
+            for pattern, entity_type, priority in sorted(
+                self.patterns, key=lambda x: x[2], reverse=True
+            )
+            if self._should_detect(entity_type)
+        ]
+
     def _should_detect(self, entity_type: str) -> bool:
         """Check if this entity type should be detected."""
         if self.entity_types is None:
@@ -234,13 +244,7 @@ class EnhancedRegexDetector(BaseDetector):
         results: List[DetectorResult] = []
         seen_spans = set()  # Track (start, end) to avoid duplicates
 
-        # Sort patterns by priority (descending)
-        sorted_patterns = sorted(self.patterns, key=lambda x: x[2], reverse=True)
-
-        for pattern, entity_type, priority in sorted_patterns:
-            if not self._should_detect(entity_type):
-                continue
-
+        for pattern, entity_type, priority in self._active_patterns:
             for match in pattern.finditer(text):
                 span = (match.start(), match.end())
 
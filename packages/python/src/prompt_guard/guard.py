@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List, Dict, Tuple, Any, Optional
+import copy
+import re
+import sys
 import yaml
 import pathlib
 
@@ -15,6 +19,151 @@ from .types import (
 )
 from .report import generate_detection_report
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Mappings at least this large are matched with an Aho-Corasick automaton
+# (when pyahocorasick is installed); smaller ones use a regex alternation.
+AHOCORASICK_MIN_PLACEHOLDERS = 32
+
+
+@lru_cache(maxsize=256)
+def _placeholder_pattern(placeholders: frozenset) -> re.Pattern:
+    """
+    Compile a regex matching any of the given placeholders.
+
+    Longer placeholders come first so one never shadows a longer one it
+    prefixes. Cached because a mapping is typically applied to many texts
+    (e.g., every chunk of a streamed response).
+    """
+    return re.compile(
+        "|".join(re.escape(p) for p in sorted(placeholders, key=len, reverse=True))
+    )
+
+
+@lru_cache(maxsize=32)
+def _template_pattern(templates: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile a regex matching any placeholder the given templates produce.
+
+    Unlike _placeholder_pattern this does not depend on a mapping, so one
+    compiled pattern serves every mapping built from the same policy.
+    """
+    return re.compile(
+        "|".join(
+            r"\d+".join(re.escape(part) for part in template.split("{i}"))
+            for template in sorted(set(templates), key=len, reverse=True)
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def _placeholder_automaton(placeholders: frozenset) -> "ahocorasick.Automaton":
+    """Build an Aho-Corasick automaton over the given placeholders."""
+    automaton = ahocorasick.Automaton()
+    for placeholder in placeholders:
+        automaton.add_word(placeholder, placeholder)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=256)
+def _placeholder_prefixes(placeholders: frozenset) -> frozenset:
+    """Collect every proper prefix of the given placeholders."""
+    return frozenset(p[:i] for p in placeholders for i in range(1, len(p)))
+
+
+@lru_cache(maxsize=16)
+def _parse_policy(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a policy YAML file; keyed on mtime so edited files are re-read."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _read_policy(policy_path: pathlib.Path) -> Dict[str, Any]:
+    """
+    Load a policy file, parsing each version of it only once per process.
+
+    Each caller gets its own copy, so a guard changing its policy does not
+    affect other guards.
+    """
+    return copy.deepcopy(
+        _parse_policy(str(policy_path), policy_path.stat().st_mtime_ns)
+    )
+
+
+def _stream_safe_end(text: str, mapping: Mapping) -> int:
+    """
+    Find where a streamed buffer can be cut for de-anonymization.
+
+    Everything before the returned index can be de-anonymized and emitted
+    now; the rest is a trailing fragment that may still grow into a
+    placeholder once more of the stream arrives.
+    """
+    if not mapping:
+        return len(text)
+
+    prefixes = _placeholder_prefixes(frozenset(mapping))
+    longest = max(map(len, mapping))
+    # Prefer the longest candidate so a partial placeholder is held whole
+    for size in range(min(longest - 1, len(text)), 0, -1):
+        if text[-size:] in prefixes:
+            return len(text) - size
+    return len(text)
+
+
+def _uses_automaton(placeholders: frozenset) -> bool:
+    """Whether placeholders are matched with Aho-Corasick rather than a regex."""
+    return AHOCORASICK_AVAILABLE and len(placeholders) >= AHOCORASICK_MIN_PLACEHOLDERS
+
+
+def _deanonymize(text: str, mapping: Mapping) -> str:
+    """Replace all placeholders in a single pass over the text."""
+    if not mapping:
+        return text
+
+    placeholders = frozenset(mapping)
+    if not _uses_automaton(placeholders):
+        pattern = _placeholder_pattern(placeholders)
+        return pattern.sub(lambda m: mapping[m.group(0)], text)
+
+    # iter_long yields non-overlapping, longest matches left to right
+    parts = []
+    last_idx = 0
+    for end_idx, placeholder in _placeholder_automaton(placeholders).iter_long(text):
+        start_idx = end_idx - len(placeholder) + 1
+        parts.append(text[last_idx:start_idx])
+        parts.append(mapping[placeholder])
+        last_idx = end_idx + 1
+    parts.append(text[last_idx:])
+    return "".join(parts)
+
+
+class _AnonymizeCache:
+    """
+    Memoized anonymization for one framework adapter instance.
+
+    RAG and chat callers often resend the same prompt. Each adapter owns
+    its cache, so cached prompts and mappings live only as long as the
+    adapter and clearing one adapter's cache leaves the others alone.
+    Every call returns its own copy of the mapping, so callers may store
+    or mutate it.
+    """
+
+    def __init__(self, guard: Any, maxsize: int = 1024):
+        self._anonymize = lru_cache(maxsize=maxsize)(guard.anonymize)
+
+    def __call__(self, text: str) -> AnonymizeResult:
+        anonymized, mapping = self._anonymize(text)
+        return anonymized, dict(mapping)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._anonymize.cache_clear()
+
 
 class PromptGuard:
     """
@@ -56,6 +205,14 @@ class PromptGuard:
         for name in names:
             if name == "regex":
                 instances.append(RegexDetector())
+            elif name == "re2":
+                try:
+                    instances.append(RegexDetector(engine="re2"))
+                except ImportError:
+                    raise ValueError(
+                        "RE2 regex detector is not available. "
+                        "Install it with: pip install google-re2"
+                    )
             elif name == "presidio":
                 try:
                     from .detectors.presidio_detector import PresidioDetector
@@ -68,7 +225,7 @@ class PromptGuard:
             else:
                 raise ValueError(
                     f"Unknown detector backend: {name}. "
-                    f"Currently supported: ['regex', 'presidio']"
+                    f"Currently supported: ['regex', 're2', 'presidio']"
                 )
         return instances
 
@@ -86,8 +243,7 @@ class PromptGuard:
         if not policy_path.exists():
             raise FileNotFoundError(f"Policy file not found: {policy_path}")
 
-        with policy_path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return _read_policy(policy_path)
 
     def _resolve_overlaps(self, results: List[DetectorResult]) -> List[DetectorResult]:
         """
@@ -226,16 +382,52 @@ class PromptGuard:
             A tuple of (anonymized_text, mapping) where mapping is a dict
             of placeholder -> original value
         """
-        # Handle options
+        options = self._resolve_options(options, min_confidence)
+        return self._anonymize(text, options, self._placeholder_templates())
+
+    def _resolve_options(
+        self,
+        options: Optional[AnonymizeOptions],
+        min_confidence: Optional[float],
+    ) -> AnonymizeOptions:
+        """Build the effective options from the anonymize arguments."""
         if options is None:
             options = AnonymizeOptions()
             if min_confidence is not None:
                 options.min_confidence = min_confidence
+        return options
+
+    def _placeholder_templates(self) -> Dict[str, str]:
+        """Resolve the placeholder template of each configured entity type."""
+        return {
+            entity_type: entity_cfg.get("placeholder", f"[{entity_type}_{{i}}]")
+            for entity_type, entity_cfg in self.policy.get("entities", {}).items()
+            if entity_cfg
+        }
 
+    def _anonymize(
+        self,
+        text: str,
+        options: AnonymizeOptions,
+        templates: Dict[str, str],
+        entities: Optional[Dict[Tuple[str, str], str]] = None,
+        counters: Optional[Dict[str, int]] = None,
+    ) -> AnonymizeResult:
+        """
+        Anonymize one text with already-resolved options and templates.
+
+        ``entities`` ((entity type, original) -> placeholder) and
+        ``counters`` (last index per entity type) may be shared across calls so that texts reuse
+        each other's placeholders and never collide.
+        """
         all_results: List[DetectorResult] = []
         for detector in self.detectors:
             all_results.extend(detector.detect(text))
 
+        # Nothing to replace: return the text as-is
+        if not all_results:
+            return text, {}
+
         # Filter by confidence if needed
         if options.min_confidence > 0:
             all_results = [
@@ -249,32 +441,45 @@ class PromptGuard:
         # Sort by start index so replacements are stable
         all_results.sort(key=lambda r: r.start)
 
-        policy_entities = self.policy.get("entities", {})
         mapping: Mapping = {}
         anonymized = []
+        append = anonymized.append
         last_idx = 0
 
+        # Placeholder per entity type and original value, so repeats share
+        # one placeholder
+        if entities is None:
+            entities = {}
         # Counter per entity type
-        counters: Dict[str, int] = {}
+        if counters is None:
+            counters = {}
 
         for res in all_results:
-            entity_cfg = policy_entities.get(res.entity_type)
-            if not entity_cfg:
+            entity_type = res.entity_type
+            placeholder_tpl = templates.get(entity_type)
+            if placeholder_tpl is None:
                 continue  # skip unconfigured entity types
 
             # Add text before this entity
-            anonymized.append(text[last_idx : res.start])
-
-            # Compute placeholder
-            counters[res.entity_type] = counters.get(res.entity_type, 0) + 1
-            i = counters[res.entity_type]
-            placeholder_tpl = entity_cfg.get(
-                "placeholder", f"[{res.entity_type}_{{i}}]"
-            )
-            placeholder = placeholder_tpl.format(i=i)
-
-            anonymized.append(placeholder)
-            mapping[placeholder] = res.text
+            append(text[last_idx : res.start])
+
+            # Merged overlapping detections carry no text of their own
+            original = res.text or text[res.start : res.end]
+
+            # Compute placeholder, reusing the one of a value seen before
+            # as the same entity type
+            key = (entity_type, original)
+            placeholder = entities.get(key) if original else None
+            if placeholder is None:
+                i = counters[entity_type] = counters.get(entity_type, 0) + 1
+                # Interned so the same placeholder across texts and mappings
+                # is one object, letting dict probes match on identity
+                placeholder = sys.intern(placeholder_tpl.format(i=i))
+                if original:
+                    entities[key] = placeholder
+
+            append(placeholder)
+            mapping[placeholder] = original
 
             last_idx = res.end
 
@@ -330,16 +535,14 @@ class PromptGuard:
         Returns:
             Text with placeholders replaced by original values
         """
-        result = text
-        for placeholder, original in mapping.items():
-            result = result.replace(placeholder, original)
-        return result
+        return _deanonymize(text, mapping)
 
     def batch_anonymize(
         self,
         texts: List[str],
         options: Optional[AnonymizeOptions] = None,
         min_confidence: Optional[float] = None,
+        share_placeholders: bool = False,
     ) -> List[AnonymizeResult]:
         """
         Anonymize multiple texts in batch.
@@ -348,12 +551,24 @@ class PromptGuard:
             texts: List of texts to anonymize
             options: Anonymization options (takes precedence over min_confidence)
             min_confidence: Minimum confidence threshold for ML detectors (0.0-1.0)
+            share_placeholders: Number placeholders across the whole batch, so
+                a value gets the same placeholder in every text and different
+                values never share one (e.g., messages of one conversation
+                whose mappings are combined)
 
         Returns:
             List of (anonymized_text, mapping) tuples
         """
+        # Options and placeholder templates are resolved once for the batch
+        options = self._resolve_options(options, min_confidence)
+        templates = self._placeholder_templates()
+        if not share_placeholders:
+            return [self._anonymize(text, options, templates) for text in texts]
+
+        entities: Dict[Tuple[str, str], str] = {}
+        counters: Dict[str, int] = {}
         return [
-            self.anonymize(text, options=options, min_confidence=min_confidence)
+            self._anonymize(text, options, templates, entities, counters)
             for text in texts
         ]
 
@@ -373,7 +588,23 @@ class PromptGuard:
         if len(texts) != len(mappings):
             raise ValueError("Number of texts and mappings must match")
 
-        return [
-            self.deanonymize(text, mapping)
-            for text, mapping in zip(texts, mappings)
-        ]
+        # Every mapping in a batch usually holds placeholders from this
+        # policy's templates; one template pattern then replaces them all
+        # instead of compiling a pattern per mapping
+        pattern = _template_pattern(tuple(self._placeholder_templates().values()))
+        # The same mapping is often repeated across a batch (e.g., one query's
+        # source nodes); check its keys against the templates only once
+        fits_templates: Dict[int, bool] = {}
+        results = []
+        for text, mapping in zip(texts, mappings):
+            fits = fits_templates.get(id(mapping))
+            if fits is None:
+                fits = fits_templates[id(mapping)] = bool(mapping) and all(
+                    pattern.fullmatch(p) for p in mapping
+                )
+            if fits:
+                text = pattern.sub(lambda m: mapping.get(m.group(0), m.group(0)), text)
+            else:
+                text = _deanonymize(text, mapping)
+            results.append(text)
+        return results
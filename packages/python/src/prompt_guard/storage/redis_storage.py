@@ -21,7 +21,7 @@ except ImportError:
     logger.warning("Redis not available. Install with: pip install redis")
 
 
-class RedisMapping Storage:
+class RedisMappingStorage:
     """
     Redis-based storage for PII mappings.
 
@@ -135,24 +135,18 @@ class RedisMapping Storage:
         mapping_key = self._make_key(session_id, "mapping")
         ttl = ttl or self.default_ttl
 
-        # Get existing mapping and merge
-        existing_data = self.client.get(mapping_key)
-        if existing_data:
-            existing_mapping = json.loads(existing_data)
-            existing_mapping.update(mapping)
-            mapping = existing_mapping
-
-        # Store with TTL
-        self.client.setex(
-            mapping_key,
-            ttl,
-            json.dumps(mapping),
-        )
+        # Mappings are Redis hashes: HSET merges into an existing mapping
+        # server-side, so no read or (de)serialization is needed
+        try:
+            num_entries = self._write_mapping(mapping_key, mapping, ttl)
+        except redis.ResponseError:
+            self._migrate_legacy_mapping(mapping_key)
+            num_entries = self._write_mapping(mapping_key, mapping, ttl)
 
         # Audit log
         if self.enable_audit:
             self._audit_log("mapping_stored", session_id, {
-                "num_entries": len(mapping),
+                "num_entries": num_entries,
                 "ttl": ttl,
             })
 
@@ -167,16 +161,64 @@ class RedisMapping Storage:
             PII mapping or None if not found/expired
         """
         mapping_key = self._make_key(session_id, "mapping")
-        data = self.client.get(mapping_key)
+        try:
+            data = self.client.hgetall(mapping_key)
+        except redis.ResponseError:
+            self._migrate_legacy_mapping(mapping_key)
+            data = self.client.hgetall(mapping_key)
 
-        if data is None:
+        if not data:
             return None
 
         # Audit log
         if self.enable_audit:
             self._audit_log("mapping_retrieved", session_id, {})
 
-        return json.loads(data)
+        return {key.decode(): value.decode() for key, value in data.items()}
+
+    def _write_mapping(
+        self,
+        mapping_key: str,
+        mapping: Dict[str, str],
+        ttl: int,
+    ) -> int:
+        """
+        Merge entries into a mapping hash and refresh its TTL.
+
+        Args:
+            mapping_key: Redis key of the mapping
+            mapping: Entries to add
+            ttl: TTL in seconds
+
+        Returns:
+            Number of entries in the stored mapping
+        """
+        pipe = self.client.pipeline()
+        if mapping:
+            pipe.hset(mapping_key, mapping=mapping)
+        pipe.expire(mapping_key, ttl)
+        pipe.hlen(mapping_key)
+        return pipe.execute()[-1]
+
+    def _migrate_legacy_mapping(self, mapping_key: str) -> None:
+        """
+        Convert a mapping stored as a JSON string into a hash.
+
+        Mappings written by earlier versions are JSON strings; they are
+        rewritten in place (keeping their TTL) the first time they are used.
+
+        Args:
+            mapping_key: Redis key of the mapping
+        """
+        data = self.client.get(mapping_key)
+        ttl = self.client.ttl(mapping_key)
+        pipe = self.client.pipeline()
+        pipe.delete(mapping_key)
+        if data:
+            pipe.hset(mapping_key, mapping=json.loads(data))
+            if ttl > 0:
+                pipe.expire(mapping_key, ttl)
+        pipe.execute()
 
     def delete_mapping(self, session_id: str) -> bool:
         """
@@ -155,6 +155,50 @@ class TestCaching:
             pytest.skip(f"Redis not available: {e}")
 
 
+class TestHuggingFaceAdapter:
+    """Test Hugging Face adapter."""
+
+    class FakeConversation:
+        """Minimal stand-in for ``transformers.Conversation``."""
+
+        def __init__(self, text=None):
+            self.past_user_inputs = [text] if text else []
+            self.generated_responses = []
+
+        def add_user_input(self, text):
+            self.past_user_inputs.append(text)
+
+        def iter_texts(self):
+            for text in self.past_user_inputs:
+                yield True, text
+
+    def test_conversational_numbers_placeholders_across_turns(self):
+        """Test that a new turn's PII does not reuse an earlier placeholder."""
+        from prompt_guard.adapters import huggingface_adapter
+
+        guard = PromptGuard(policy="default_pii")
+        seen = []
+
+        def pipe(conv):
+            seen.append(list(conv.past_user_inputs))
+            conv.generated_responses.append("Writing to [EMAIL_1] and [EMAIL_2]")
+            return conv
+
+        protected = huggingface_adapter.ProtectedConversational(pipe, guard)
+        conversation = self.FakeConversation("My email is john@example.com")
+        with patch.object(
+            huggingface_adapter, "_conversation_class", return_value=self.FakeConversation
+        ):
+            protected(conversation)
+            conversation.add_user_input("Also cc jane@example.com")
+            result = protected(conversation)
+
+        assert seen[-1] == ["My email is [EMAIL_1]", "Also cc [EMAIL_2]"]
+        assert result.generated_responses == [
+            "Writing to john@example.com and jane@example.com"
+        ]
+
+
 class TestRedisStorage:
     """Integration tests for Redis storage."""
 
@@ -0,0 +1,75 @@
+"""
+Integration tests for the Vercel AI SDK adapter.
+"""
+
+import pytest
+from prompt_guard import PromptGuard
+
+
+class TestVercelAIAdapter:
+    """Integration tests for Vercel AI adapter."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_split_placeholders(self):
+        """Test placeholders split across stream chunks are restored."""
+        from prompt_guard.adapters.vercel_ai_adapter import VercelAIAdapter
+
+        adapter = VercelAIAdapter(PromptGuard())
+        mapping = {"[NAME_1]": "John", "[EMAIL_1]": "john@example.com"}
+
+        async def stream():
+            for chunk in ["Hi [NA", "ME_1], mail [EMAIL_", "1] [sic]"]:
+                yield chunk
+
+        chunks = [chunk async for chunk in adapter.protect_streaming_response(stream(), mapping)]
+
+        assert "".join(chunks) == "Hi John, mail john@example.com [sic]"
+
+    @pytest.mark.asyncio
+    async def test_protect_messages_distinct_placeholders(self):
+        """Test different values in different messages never share a placeholder."""
+        from prompt_guard.adapters.vercel_ai_adapter import VercelAIAdapter
+
+        adapter = VercelAIAdapter(PromptGuard())
+        messages = [
+            {"role": "user", "content": "I am john@example.com"},
+            {"role": "assistant", "content": "Hello!"},
+            {"role": "user", "content": "Forward to jane@example.com"},
+        ]
+
+        anonymized, mapping = await adapter.protect_messages(messages)
+
+        assert [m["content"] for m in anonymized] == [
+            "I am [EMAIL_1]",
+            "Hello!",
+            "Forward to [EMAIL_2]",
+        ]
+        assert mapping == {
+            "[EMAIL_1]": "john@example.com",
+            "[EMAIL_2]": "jane@example.com",
+        }
+
+    @pytest.mark.asyncio
+    async def test_function_call_arguments(self):
+        """Test only string arguments are anonymized, with shared placeholders."""
+        from prompt_guard.adapters.vercel_ai_adapter import VercelAIAdapter
+
+        adapter = VercelAIAdapter(PromptGuard())
+        arguments = {
+            "to": "john@example.com",
+            "cc": ["jane@example.com", "john@example.com"],
+            "retries": 3,
+        }
+
+        name, anonymized, mapping = await adapter.protect_function_call("send_email", arguments)
+
+        assert name == "send_email"
+        assert anonymized == {
+            "to": "[EMAIL_1]",
+            "cc": ["[EMAIL_2]", "[EMAIL_1]"],
+            "retries": 3,
+        }
+        assert mapping == {
+            "[EMAIL_1]": "john@example.com",
+            "[EMAIL_2]": "jane@example.com",
+        }
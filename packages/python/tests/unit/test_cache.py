@@ -0,0 +1,23 @@
+"""
+Unit tests for the anonymization cache backends.
+"""
+
+from prompt_guard.cache import CacheEntry, InMemoryCache
+
+
+class TestInMemoryCache:
+    """Test the in-process cache backend."""
+
+    def test_in_memory_cache_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = InMemoryCache(max_size=2)
+        cache.set("a", CacheEntry(anonymized="a", mapping={}, timestamp=0.0))
+        cache.set("b", CacheEntry(anonymized="b", mapping={}, timestamp=0.0))
+
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get("a") is not None
+        cache.set("c", CacheEntry(anonymized="c", mapping={}, timestamp=0.0))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
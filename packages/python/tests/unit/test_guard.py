@@ -4,7 +4,20 @@ Unit tests for PromptGuard core functionality.
 
 import pytest
 from prompt_guard import PromptGuard
-from prompt_guard.types import AnonymizeOptions
+from prompt_guard.types import AnonymizeOptions, DetectorResult, OverlapStrategy
+
+
+class _FixedDetector:
+    """Detector returning spans given as (entity_type, start, end)."""
+
+    def __init__(self, spans):
+        self.spans = spans
+
+    def detect(self, text):
+        return [
+            DetectorResult(entity_type, start, end, text[start:end])
+            for entity_type, start, end in self.spans
+        ]
 
 
 class TestPromptGuardBasic:
@@ -86,6 +99,50 @@ class TestPromptGuardBasic:
 
         assert deanonymized == "Contact John Smith at john@example.com for more info"
 
+    def test_deanonymize_single_pass(self):
+        """Test that restored values are not themselves de-anonymized."""
+        guard = PromptGuard()
+        mapping = {
+            "[NAME_1]": "literal [EMAIL_1]",
+            "[EMAIL_1]": "john@example.com",
+        }
+
+        deanonymized = guard.deanonymize("[NAME_1] / [EMAIL_1]", mapping)
+
+        assert deanonymized == "literal [EMAIL_1] / john@example.com"
+
+    def test_deanonymize_large_mapping(self):
+        """Test de-anonymization with many placeholders sharing prefixes."""
+        guard = PromptGuard()
+        mapping = {f"[EMAIL_{i}]": f"user{i}@example.com" for i in range(1, 101)}
+
+        text = " ".join(f"[EMAIL_{i}]" for i in (100, 1, 10, 11, 2))
+        deanonymized = guard.deanonymize(text, mapping)
+
+        assert deanonymized == (
+            "user100@example.com user1@example.com user10@example.com "
+            "user11@example.com user2@example.com"
+        )
+
+    def test_deanonymize_streamed_chunks(self):
+        """Test that placeholders split across stream chunks are restored."""
+        from prompt_guard.guard import _stream_safe_end
+
+        guard = PromptGuard()
+        mapping = {"[EMAIL_1]": "john@example.com", "[NAME_1]": "John"}
+        text = "Hi [NAME_1], your email is [EMAIL_1] [sic]"
+
+        restored = []
+        pending = ""
+        for char in text:
+            pending += char
+            end = _stream_safe_end(pending, mapping)
+            restored.append(guard.deanonymize(pending[:end], mapping))
+            pending = pending[end:]
+        restored.append(guard.deanonymize(pending, mapping))
+
+        assert "".join(restored) == "Hi John, your email is john@example.com [sic]"
+
     def test_batch_anonymize(self):
         """Test batch anonymization."""
         guard = PromptGuard()
@@ -102,6 +159,41 @@ class TestPromptGuardBasic:
             assert isinstance(anonymized, str)
             assert isinstance(mapping, dict)
 
+    def test_batch_anonymize_shared_placeholders(self):
+        """Test batch anonymization numbering placeholders across texts."""
+        guard = PromptGuard()
+        texts = [
+            "Email: john@example.com",
+            "Email: jane@example.com or john@example.com",
+        ]
+
+        results = guard.batch_anonymize(texts, share_placeholders=True)
+
+        assert results[0] == ("Email: [EMAIL_1]", {"[EMAIL_1]": "john@example.com"})
+        assert results[1][0] == "Email: [EMAIL_2] or [EMAIL_1]"
+        assert results[1][1] == {
+            "[EMAIL_2]": "jane@example.com",
+            "[EMAIL_1]": "john@example.com",
+        }
+
+    def test_batch_deanonymize(self):
+        """Test batch de-anonymization with per-text mappings."""
+        guard = PromptGuard()
+        texts = ["Hi [NAME_1], see [EMAIL_1]", "Call [PHONE_1]", "Keep [custom]"]
+        mappings = [
+            {"[NAME_1]": "Jane Doe", "[EMAIL_1]": "jane@example.com"},
+            {"[PHONE_1]": "555-123-4567"},
+            {"[custom]": "value"},
+        ]
+
+        results = guard.batch_deanonymize(texts, mappings)
+
+        assert results == [
+            "Hi Jane Doe, see jane@example.com",
+            "Call 555-123-4567",
+            "Keep value",
+        ]
+
     def test_empty_text(self):
         """Test with empty text."""
         guard = PromptGuard()
@@ -133,12 +225,18 @@ class TestPromptGuardDetectors:
 
         assert len(mapping) > 0
 
-    @pytest.mark.skipif(
-        not pytest.importorskip("presidio_analyzer", minversion=None),
-        reason="Presidio not installed",
-    )
+    def test_re2_detector_matches_regex(self):
+        """Test the RE2 engine finds the same entities as the regex one."""
+        pytest.importorskip("re2")
+        text = "John Smith: john@example.com, 555-123-4567, SSN 123-45-6789"
+
+        expected = PromptGuard(detectors=["regex"]).anonymize(text)
+
+        assert PromptGuard(detectors=["re2"]).anonymize(text) == expected
+
     def test_presidio_detector(self):
         """Test Presidio detector if available."""
+        pytest.importorskip("presidio_analyzer")
         guard = PromptGuard(detectors=["presidio"])
         text = "My name is John and email is john@example.com"
 
@@ -224,6 +322,34 @@ class TestPromptGuardEdgeCases:
         # Should detect as email, not as separate name components
         assert "[EMAIL_1]" in anonymized
 
+    def test_merge_same_type_distinct_values(self):
+        """Test merged spans get their own placeholders and originals."""
+        guard = PromptGuard(overlap_strategy=OverlapStrategy.MERGE_SAME_TYPE)
+        text = "Call 555-0100 or 555-0199"
+        guard.detectors = [
+            _FixedDetector([
+                ("PHONE", 5, 10), ("PHONE", 8, 13),
+                ("PHONE", 17, 22), ("PHONE", 20, 25),
+            ])
+        ]
+
+        anonymized, mapping = guard.anonymize(text)
+
+        assert anonymized == "Call [PHONE_1] or [PHONE_2]"
+        assert mapping == {"[PHONE_1]": "555-0100", "[PHONE_2]": "555-0199"}
+        assert guard.deanonymize(anonymized, mapping) == text
+
+    def test_same_value_different_types(self):
+        """Test one string detected as two entity types gets two placeholders."""
+        guard = PromptGuard()
+        text = "5550100 and 5550100"
+        guard.detectors = [_FixedDetector([("PHONE", 0, 7), ("SSN", 12, 19)])]
+
+        anonymized, mapping = guard.anonymize(text)
+
+        assert anonymized == "[PHONE_1] and [SSN_1]"
+        assert guard.deanonymize(anonymized, mapping) == text
+
 
 class TestPromptGuardPerformance:
     """Performance-related tests."""
@@ -119,9 +119,9 @@ class PromptGuardUser(HttpUser):
         Weight: 5
         """
         with self.client.get(
-            "/metrics",
+            "/metrics/json",
             catch_response=True,
-            name="/metrics"
+            name="/metrics/json"
         ) as response:
             if response.status_code == 200:
                 try: